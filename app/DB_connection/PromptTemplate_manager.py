@@ -11,6 +11,11 @@ Key Functions:
 - create_prompt_template: Creates a new prompt template in the database.
 - update_prompt_template: Updates an existing prompt template.
 
+Compiled client templates are cached in memory by name for
+PROMPT_TEMPLATE_CACHE_TTL_SECONDS (default: 300), so most requests render a
+template without a database query or a Jinja2 compile. Updates invalidate the
+entry in this process; other workers pick up the change when the entry expires.
+
 Author: Ramazan Seçilmiş
 Version: 1.0.0
 """
@@ -24,13 +29,10 @@ from app.DB_connection.database import get_db
 from app.models.DBModels import PromptTemplate
 from app.models.DataModels import SystemPrompt, PromptTemplateCreate
 from datetime import datetime, timezone
-from dotenv import load_dotenv
 from app.utils.console_logger import info, warning, error, debug
+from app.utils.cache_utils import TTLCache
 
 
-# Load environment variables from .env file
-load_dotenv()
-
 # It's generally better to load file resources once, for example when the app starts.
 # Reading at the module level is okay for simplicity but can have side effects.
 isRootEnable = os.getenv('ROOT_PROMPT_ENABLE', 'false').lower() == 'true'
@@ -45,6 +47,9 @@ except FileNotFoundError:
     warning("Root prompt file not found, using default template", "[PromptManager]")
     root_template = Template("{{ client_systemprompt }}") # Fallback to a simple template
 
+# Compiled client templates by name
+_template_cache = TTLCache(ttl=float(os.getenv("PROMPT_TEMPLATE_CACHE_TTL_SECONDS", "300")), maxsize=256)
+
 
 async def get_rendered_prompt(system_prompt: SystemPrompt | None) -> str | None:
     """
@@ -68,12 +73,14 @@ async def get_rendered_prompt(system_prompt: SystemPrompt | None) -> str | None:
             return None
 
         info(f"Rendering prompt template: {system_prompt.template_name}", "[PromptManager]")
-        async for db in get_db():
-            result = await db.execute(
-                select(PromptTemplate)
-                .where(PromptTemplate.name == system_prompt.template_name)
-            )
-            template_record = result.scalars().first()
+        client_prompt_template = _template_cache.get(system_prompt.template_name)
+        if client_prompt_template is None:
+            async for db in get_db():
+                result = await db.execute(
+                    select(PromptTemplate.prompt)
+                    .where(PromptTemplate.name == system_prompt.template_name)
+                )
+                prompt = result.scalars().first()
 
             # # Basic tenant field validation
             # for field in system_prompt.tenants:
@@ -81,20 +88,25 @@ async def get_rendered_prompt(system_prompt: SystemPrompt | None) -> str | None:
             #         error(f"Invalid tenant field '{field}' for template '{system_prompt.template_name}'\n valid template fields: {template_record.tenant_fields}", "[PromptManager]")
             #         raise ValueError(f"Invalid tenant field '{field}' for template '{system_prompt.template_name}'")
 
-            # 1. Render the client-specific prompt from the DB using the tenants
-            if not template_record:
-                warning(f"Prompt template not found: {system_prompt.template_name} empty template will be used", "[PromptManager]")
-                rendered_client_prompt = ""
-            else:
-                client_prompt_template = Template(template_record.prompt)
-                rendered_client_prompt = client_prompt_template.render(system_prompt.tenants)
-            
-            # 2. Render the root prompt using the result from the previous step
-            if isRootEnable:
-                return root_template.render(client_systemprompt=rendered_client_prompt)
-            else:
-                    warning('[RENDERER] Warning!! root prompt disabled. open from env if needed')
-                    return rendered_client_prompt
+            if prompt is not None:
+                client_prompt_template = Template(prompt)
+                _template_cache.set(system_prompt.template_name, client_prompt_template)
+        else:
+            debug(lambda: f"Using cached prompt template: {system_prompt.template_name}", "[PromptManager]")
+
+        # 1. Render the client-specific prompt from the DB using the tenants
+        if client_prompt_template is None:
+            warning(f"Prompt template not found: {system_prompt.template_name} empty template will be used", "[PromptManager]")
+            rendered_client_prompt = ""
+        else:
+            rendered_client_prompt = client_prompt_template.render(system_prompt.tenants)
+        
+        # 2. Render the root prompt using the result from the previous step
+        if isRootEnable:
+            return root_template.render(client_systemprompt=rendered_client_prompt)
+        else:
+                warning('[RENDERER] Warning!! root prompt disabled. open from env if needed')
+                return rendered_client_prompt
     except Exception as e:
         error(f"Error rendering prompt template at line {e.__traceback__.tb_lineno}: {e}", "[PromptManager]")
         raise e
@@ -131,7 +143,6 @@ async def create_prompt_template(template_data: PromptTemplateCreate) -> PromptT
             
             db.add(new_template)
             await db.commit()
-            await db.refresh(new_template)
             info(f"Prompt template created successfully with ID: {new_template.name}", "[PromptManager]")
             return new_template
     except Exception as e:
@@ -165,7 +176,7 @@ async def update_prompt_template(template_name: str, template_data: PromptTempla
             existing_template.prompt = template_data.prompt
             existing_template.tenant_fields = template_data.tenant_fields
             await db.commit()
-            await db.refresh(existing_template)
+            _template_cache.invalidate(template_name)
             info(f"Prompt template '{template_name}' updated successfully", "[PromptManager]")
             return existing_template
     except Exception as e:
@@ -22,7 +22,7 @@ from app.DB_connection.database import get_db
 from app.models.DBModels import APIKey
 from app.models.DataModels import Response
 from app.utils.console_logger import info, error, debug
-import os
+from app.utils.config import CONFIG
 from typing import Tuple
 
 async def get_api_key(provider: str, client_id: str) -> Tuple[str, bool]:
@@ -46,7 +46,7 @@ async def get_api_key(provider: str, client_id: str) -> Tuple[str, bool]:
     """
     try:
         info(f"Retrieving API key for provider: {provider}", "[APIManager]")
-        debug(f"client_id: {client_id}", "[APIManager]")
+        debug(lambda: f"client_id: {client_id}", "[APIManager]")
         
         async for db in get_db():
             result = await db.execute(
@@ -57,13 +57,13 @@ async def get_api_key(provider: str, client_id: str) -> Tuple[str, bool]:
             api_key = result.scalar()
             
             if api_key:
-                debug(f"API key found in database for provider: {provider}", "[APIManager]")
+                debug(lambda: f"API key found in database for provider: {provider}", "[APIManager]")
                 return api_key.api_key, True
             
-            # If no API key in database, try environment variable
-            env_key = os.getenv(f"{provider.upper()}_API_KEY")
+            # If no API key in database, try the system key loaded from the environment
+            env_key = CONFIG.api_key(provider)
             if env_key:
-                debug(f"Using environment API key for provider: {provider}", "[APIManager]")
+                debug(lambda: f"Using environment API key for provider: {provider}", "[APIManager]")
                 return env_key, False
             
             # No API key found anywhere
@@ -90,7 +90,7 @@ async def store_api_key(provider: str, client_id: str, api_key: str):
     """
     try:
         info(f"Storing API key for provider: {provider}", "[APIManager]")
-        debug(f"client_id: {client_id}", "[APIManager]")
+        debug(lambda: f"client_id: {client_id}", "[APIManager]")
         
         async for db in get_db():
             # Check if an API key already exists
@@ -104,7 +104,7 @@ async def store_api_key(provider: str, client_id: str, api_key: str):
             if existing_key:
                 # Update existing key
                 existing_key.api_key = api_key
-                debug(f"Updated existing API key for provider: {provider}", "[APIManager]")
+                debug(lambda: f"Updated existing API key for provider: {provider}", "[APIManager]")
             else:
                 # Create new key
                 new_key = APIKey(
@@ -113,7 +113,7 @@ async def store_api_key(provider: str, client_id: str, api_key: str):
                     provider=provider
                 )
                 db.add(new_key)
-                debug(f"Created new API key for provider: {provider}", "[APIManager]")
+                debug(lambda: f"Created new API key for provider: {provider}", "[APIManager]")
             
             await db.commit()
             
@@ -134,7 +134,7 @@ async def delete_api_key(provider: str, client_id: str):
     """
     try:
         info(f"Deleting API key for provider: {provider}", "[APIManager]")
-        debug(f"client_id: {client_id}", "[APIManager]")
+        debug(lambda: f"client_id: {client_id}", "[APIManager]")
         
         async for db in get_db():
             await db.execute(
@@ -159,7 +159,7 @@ async def update_api_key(provider: str, client_id: str, api_key: str):
     """
     try:
         info(f"Updating API key for provider: {provider}", "[APIManager]")
-        debug(f"client_id: {client_id}", "[APIManager]")    
+        debug(lambda: f"client_id: {client_id}", "[APIManager]")    
 
         async for db in get_db():
             await db.execute(
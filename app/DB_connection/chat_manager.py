@@ -6,110 +6,358 @@ database. It handles the creation of new chats, retrieval of chat history, and
 the addition of new messages to a conversation.
 
 Key Functions:
-- create_chat: Creates a new chat session for a client.
-- chat_history: Retrieves the full message history for a given chat.
-- add_message: Adds a new message to a chat with an auto-incrementing index.
+- add_message: Adds a new message to a chat at the next free index.
+- prepare_chat_turn: Resolves the chat ID for a turn, reads its history
+  (including queued replies not yet written) and reserves the message indexes
+  for the turn.
+- store_chat_turn: Creates the chat if needed and stores the user message in a
+  single transaction.
+- queue_message: Hands a message with its reserved index to the background
+  writer, or writes it directly when the writer's queue is full.
+- add_messages: Adds a batch of indexed messages, possibly across chats, in one
+  INSERT.
+- message_writer: Background consumer that persists queued messages off the
+  request path in small batches.
+
+Message indexes are reserved in memory, per process. With several workers, two
+turns in the same chat can reserve the same index; the (index, chat_id) primary
+key rejects the second insert, which is then retried at the next free index in
+the table, so no message is lost (the turn order may interleave).
 
 Author: Ramazan Seçilmiş
 Version: 1.0.0
 """
-from typing import Dict, List
-from uuid import UUID
+import asyncio
+import os
+from typing import Dict, List, Tuple
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
 from app.DB_connection.database import get_db
 from app.models.DBModels import Chat, Message
-from app.utils.console_logger import info, error, debug
+from app.utils.cache_utils import TTLCache
+from app.utils.console_logger import info, warning, error, debug
 from app.models.DataModels import message
 
-async def create_chat(client_id: UUID) -> UUID:
+# Messages queued for the background writer but not stored yet: chat_id -> {index: message}.
+# prepare_chat_turn merges them into the history so a quick follow-up turn sees them.
+_pending_messages: Dict[UUID, Dict[int, message]] = {}
+# Next free message index per chat, handed out by prepare_chat_turn so turns in
+# the same chat never pick the same index while earlier writes are in flight.
+# Entries only need to outlive those writes; after that the stored rows are used.
+_reserved_indexes = TTLCache(ttl=600, maxsize=100_000)
+
+# PostgreSQL SQLSTATE for unique_violation, raised when a message's (index, chat_id)
+# primary key is already taken
+_UNIQUE_VIOLATION = "23505"
+
+
+def _is_index_collision(e: IntegrityError) -> bool:
+    """Tells a taken message index apart from other integrity errors (e.g. a missing chat)."""
+    return getattr(e.orig, "sqlstate", None) == _UNIQUE_VIOLATION
+
+
+async def _next_stored_index(db, chat_id: UUID) -> int:
+    """Returns the index after the highest one stored for a chat."""
+    result = await db.execute(
+        select(Message.index)
+        .where(Message.chat_id == chat_id)
+        .order_by(Message.index.desc())
+        .limit(1)
+    )
+    last_index = result.scalar_one_or_none()
+    return (last_index + 1) if last_index is not None else 0
+
+
+async def add_message(chat_id:UUID, message: message) -> Message:
     """
-    Creates a new chat session for a given client.
+    Adds a new message to a chat session at the next free index.
     
     Args:
-        client_id (UUID): The unique identifier of the client starting the chat.
+        chat_id (UUID): The unique identifier of the chat.
+        message (message): The message object to add to the chat.
         
     Returns:
-        UUID: The unique identifier of the newly created chat session.
+        Message: The newly created message object from the database.
     """
     try:
-        info(f"Creating new chat", "[ChatManager]")
-        debug(f"chat for client_id: {client_id}", "[ChatManager]")
         async for db in get_db():
-            new_chat = Chat(
-                client_id=client_id
+            next_index = await _next_stored_index(db, chat_id)
+
+            new_message = Message(
+                chat_id=chat_id,
+                role=message.role,
+                content=message.content,
+                index=next_index
             )
-            db.add(new_chat)
+            db.add(new_message)
             await db.commit()
-            await db.refresh(new_chat)
-            debug(f"chat created with id: {new_chat.id}", "[ChatManager]")
-            return new_chat.id 
+            debug(lambda: f"message added to chat: {chat_id} with index: {next_index}", "[ChatManager]")
+            return new_message
     except Exception as e:
-        error(f"Error creating chat at line {e.__traceback__.tb_lineno}: {e}", "[ChatManager]")
+        await db.rollback()
+        error(f"Error adding message at line {e.__traceback__.tb_lineno}: {e}", "[ChatManager]")
         raise e
-    
-async def chat_history(chat_id:UUID | None) -> List[message]:
+
+
+async def prepare_chat_turn(chat_id: UUID | None, user_message: message) -> Tuple[UUID, List[message], int]:
     """
-    Retrieves the message history for a given chat session.
+    Resolves the chat for a new turn and reads its history, without writing.
+    
+    If chat_id is None a new chat ID is generated client-side and no query is
+    made. Otherwise the chat's history is read in one query, and messages still
+    waiting in the background writer's queue are merged in by index. Storing
+    the turn is left to store_chat_turn so it can run concurrently with the
+    provider call.
+    
+    Two indexes are reserved for the turn: the returned one for the user
+    message and the one after it for the assistant reply (see queue_message).
     
     Args:
-        chat_id (UUID | None): The unique identifier of the chat.
+        chat_id (UUID | None): The existing chat's ID, or None to start a new chat.
+        user_message (message): The new user message.
         
     Returns:
-        List[message]: A list of message objects representing the conversation history.
+        Tuple[UUID, List[message], int]: The chat ID, the conversation history
+        ending with the new user message, and the index for that message.
+        
+    Raises:
+        ValueError: If chat_id is given but the chat has no stored or queued messages.
     """
     try:
-        result = []
         if chat_id is None:
-            return result
+            # A new chat has no history to read
+            chat_id = uuid4()
+            _reserved_indexes.set(chat_id, 2)
+            return chat_id, [user_message], 0
+
+        # Taken before the query: a queued message is then either still pending
+        # here or already committed and returned by the query
+        pending = dict(_pending_messages.get(chat_id, ()))
         async for db in get_db():
-            messages_result = await db.execute(select(Message).where(Message.chat_id == chat_id).order_by(Message.index))
-            messages = messages_result.scalars().all()
-        
-            for msg in messages:
-                result.append(message(role=msg.role, content=msg.content))
-            return result
+            result = await db.execute(
+                select(Message.index, Message.role, Message.content)
+                .where(Message.chat_id == chat_id)
+                .order_by(Message.index)
+            )
+            rows = result.all()
+        if not rows and not pending:
+            # Checked before anything is dispatched, so an unknown or deleted chat
+            # fails here instead of on the user message's insert after the provider call
+            raise ValueError("Chat not found")
+        # Rows come from our own table, so they are not re-validated
+        if pending:
+            for index, role, content in rows:
+                pending[index] = message.model_construct(role=role, content=content)
+            indexes = sorted(pending)
+            history = [*(pending[index] for index in indexes), user_message]
+            last_index = indexes[-1]
+        else:
+            # Common case: nothing queued, the list is built in one pass
+            history = [*(message.model_construct(role=role, content=content) for _, role, content in rows), user_message]
+            last_index = rows[-1][0] if rows else -1
+        next_index = max(last_index + 1, _reserved_indexes.get(chat_id, 0))
+        _reserved_indexes.set(chat_id, next_index + 2)
+        return chat_id, history, next_index
+    except ValueError:
+        raise
     except Exception as e:
-        error(f"Error getting chat history at line {e.__traceback__.tb_lineno}: {e}", "[ChatManager]")
+        error(f"Error preparing chat turn at line {e.__traceback__.tb_lineno}: {e}", "[ChatManager]")
         raise e
-         
 
-         
-async def add_message(chat_id:UUID, message: message) -> Message:
+
+async def store_chat_turn(chat_id: UUID, client_id: UUID, user_message: message, index: int, new_chat: bool) -> int:
     """
-    Adds a new message to a chat session with an auto-incrementing index.
+    Stores the user message of a chat turn, creating the chat first if needed.
+    
+    Both inserts run in one session and one transaction. If the reserved index
+    was already taken (by a turn handled in another worker), the message is
+    stored at the next free index instead.
     
     Args:
-        chat_id (UUID): The unique identifier of the chat.
-        message (message): The message object to add to the chat.
+        chat_id (UUID): The chat's ID, as returned by prepare_chat_turn.
+        client_id (UUID): The unique identifier of the client.
+        user_message (message): The user message to store.
+        index (int): The message index, as returned by prepare_chat_turn.
+        new_chat (bool): Whether the chat row must be created.
         
     Returns:
-        Message: The newly created message object from the database.
+        int: The index the message was stored at; the reply goes right after it.
     """
     try:
         async for db in get_db():
-            # Get the highest index for this chat
-            last_message_result = await db.execute(
-                select(Message.index)
-                .where(Message.chat_id == chat_id)
-                .order_by(Message.index.desc())
-                .limit(1)
-            )
-            last_index = last_message_result.scalar_one_or_none()
-            next_index = (last_index + 1) if last_index is not None else 0
+            for attempt in range(2):
+                try:
+                    if new_chat:
+                        await db.execute(insert(Chat).values(id=chat_id, client_id=client_id))
+                        debug(lambda: f"chat created with id: {chat_id}", "[ChatManager]")
+                    await db.execute(insert(Message).values(
+                        chat_id=chat_id,
+                        role=user_message.role,
+                        content=user_message.content,
+                        index=index
+                    ))
+                    await db.commit()
+                    break
+                except IntegrityError as e:
+                    await db.rollback()
+                    if attempt or not _is_index_collision(e):
+                        raise
+                    warning(f"Message index {index} already taken in chat {chat_id}; using the next free index", "[ChatManager]")
+                    index = await _next_stored_index(db, chat_id)
+                    _reserved_indexes.set(chat_id, index + 2)
+            debug(lambda: f"message added to chat: {chat_id} with index: {index}", "[ChatManager]")
+            return index
+    except Exception as e:
+        error(f"Error storing chat turn at line {e.__traceback__.tb_lineno}: {e}", "[ChatManager]")
+        raise e
 
-            new_message = Message(
-                chat_id=chat_id,
-                role=message.role,
-                content=message.content,
-                index=next_index
-            )
-            db.add(new_message)
-            await db.commit()
-            await db.refresh(new_message)
-            debug(f"message added to chat: {chat_id} with index: {next_index}", "[ChatManager]")
-            return new_message
+
+async def queue_message(queue: "asyncio.Queue[Tuple[UUID, int, message]]", chat_id: UUID, index: int, msg: message) -> None:
+    """
+    Queues a message for the background writer under an index reserved by prepare_chat_turn.
+    
+    Until it is written, the message is included in the history that
+    prepare_chat_turn returns for the chat. When the queue is full (e.g. the
+    database is slow or down), the message is written directly instead, so
+    the caller waits for the write and neither the queue nor the pending
+    messages keep growing.
+    
+    Args:
+        queue (asyncio.Queue[Tuple[UUID, int, message]]): The writer's queue.
+        chat_id (UUID): The unique identifier of the chat.
+        index (int): The message index, e.g. the user message's index + 1 for a reply.
+        msg (message): The message to store.
+    """
+    try:
+        queue.put_nowait((chat_id, index, msg))
+    except asyncio.QueueFull:
+        warning(f"Message queue full; writing message {index} for chat {chat_id} directly", "[ChatManager]")
+        # A single attempt: the caller is waiting, and retries would only hold it longer
+        await _write_individually([(chat_id, index, msg)], attempts=1)
+        return
+    _pending_messages.setdefault(chat_id, {})[index] = msg
+
+
+def _forget_pending(items: List[Tuple[UUID, int, message]]) -> None:
+    """Removes handled items from the pending messages."""
+    for chat_id, index, _ in items:
+        pending = _pending_messages.get(chat_id)
+        if pending is not None:
+            pending.pop(index, None)
+            if not pending:
+                del _pending_messages[chat_id]
+
+
+async def add_messages(items: List[Tuple[UUID, int, message]]) -> None:
+    """
+    Adds a batch of indexed messages in a single transaction and INSERT statement.
+    
+    Args:
+        items (List[Tuple[UUID, int, message]]): (chat_id, index, message) triples.
+    """
+    try:
+        async for db in get_db():
+            rows = [{"chat_id": chat_id, "role": msg.role, "content": msg.content, "index": index}
+                    for chat_id, index, msg in items]
+            try:
+                await db.execute(insert(Message), rows)
+                await db.commit()
+            except Exception:
+                # Roll back now so the connection is clean for a retry
+                await db.rollback()
+                raise
+            debug(lambda: f"{len(rows)} messages added", "[ChatManager]")
     except Exception as e:
-        await db.rollback()
-        error(f"Error adding message at line {e.__traceback__.tb_lineno}: {e}", "[ChatManager]")
+        error(f"Error adding messages at line {e.__traceback__.tb_lineno}: {e}", "[ChatManager]")
         raise e
+
+
+async def _write_one(chat_id: UUID, index: int, msg: message, attempts: int) -> None:
+    """
+    Writes one message in its own transaction, retrying transient failures.
+    
+    A message whose reserved index was taken meanwhile is stored at the next
+    free index with add_message. Other integrity errors (e.g. the chat was
+    deleted) cannot succeed on retry, so the message is dropped at once. Any
+    other error (e.g. a lost connection or pool timeout) is retried up to
+    `attempts` times in total, with exponential backoff, before the message
+    is dropped.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            try:
+                await add_messages([(chat_id, index, msg)])
+            except IntegrityError as e:
+                if not _is_index_collision(e):
+                    raise
+                warning(f"Message index {index} already taken in chat {chat_id}; using the next free index", "[ChatManager]")
+                await add_message(chat_id, msg)
+            return
+        except IntegrityError as e:
+            error(f"Background write of message {index} for chat {chat_id} failed, message dropped: {e}", "[ChatManager]")
+            return
+        except Exception as e:
+            if attempt == attempts:
+                error(f"Background write of message {index} for chat {chat_id} failed after {attempts} attempts, message dropped: {e}", "[ChatManager]")
+                return
+            delay = MESSAGE_RETRY_DELAY * 2 ** (attempt - 1)
+            warning(f"Background write of message {index} for chat {chat_id} failed, retrying in {delay}s: {e}", "[ChatManager]")
+            await asyncio.sleep(delay)
+
+
+async def _write_individually(items: List[Tuple[UUID, int, message]], attempts: int | None = None) -> None:
+    """
+    Writes messages one per transaction with _write_one.
+    
+    Args:
+        items (List[Tuple[UUID, int, message]]): (chat_id, index, message) triples.
+        attempts (int | None): Attempts per message, MESSAGE_WRITE_ATTEMPTS if None.
+    """
+    for chat_id, index, msg in items:
+        await _write_one(chat_id, index, msg, MESSAGE_WRITE_ATTEMPTS if attempts is None else attempts)
+
+
+# Upper bound on how many queued messages are written in one INSERT
+MESSAGE_BATCH_SIZE = 64
+# Upper bound on how many messages wait for the background writer; see queue_message
+MESSAGE_QUEUE_SIZE = int(os.getenv("MESSAGE_QUEUE_SIZE", "1024"))
+# Attempts per message when a write fails for a reason other than an integrity
+# error, and the delay before the first retry (doubled for each further one)
+MESSAGE_WRITE_ATTEMPTS = 3
+MESSAGE_RETRY_DELAY = 0.5
+
+
+async def message_writer(queue: "asyncio.Queue[Tuple[UUID, int, message]]") -> None:
+    """
+    Drains queued (chat_id, index, message) triples and persists them in batches.
+    
+    Runs as a long-lived background task started in the application lifespan so
+    endpoints can hand off message writes without awaiting a DB round-trip.
+    After each wait, everything already queued (up to MESSAGE_BATCH_SIZE items)
+    is written with one add_messages call. If the batch fails, its messages are
+    written one at a time, so a bad row only affects its own message. A taken
+    index is resolved by storing the message at the next free index; transient
+    errors are retried up to MESSAGE_WRITE_ATTEMPTS times. A message that still
+    cannot be written (e.g. its chat was deleted, or the database stayed
+    unreachable) is logged and dropped, and then no longer appears in the history.
+    
+    Args:
+        queue (asyncio.Queue[Tuple[UUID, int, message]]): The queue to consume from.
+    """
+    info("Message writer started", "[ChatManager]")
+    while True:
+        batch = [await queue.get()]
+        while not queue.empty() and len(batch) < MESSAGE_BATCH_SIZE:
+            batch.append(queue.get_nowait())
+        try:
+            await add_messages(batch)
+        except Exception as e:
+            if len(batch) > 1:
+                warning(f"Background write of {len(batch)} messages failed, retrying one at a time: {e}", "[ChatManager]")
+            await _write_individually(batch)
+        finally:
+            _forget_pending(batch)
+            for _ in batch:
+                queue.task_done()
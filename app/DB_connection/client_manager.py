@@ -8,10 +8,20 @@ verifying passwords.
 Key Functions:
 - create_client: Creates a new client with a securely hashed password.
 - authenticate_client: Authenticates a client using their email and password.
+  Successful logins are cached briefly so repeated logins skip bcrypt.
+
+Cached logins are not evicted when a client's stored password changes or the
+client is removed outside this API (there is no endpoint for either); the old
+password keeps working until its entry expires after AUTH_CACHE_TTL_SECONDS
+(default: 60). Set it to 0 to disable the cache.
 
 Author: Ramazan Seçilmiş
 Version: 1.0.0
 """
+import asyncio
+import hashlib
+import hmac
+import os
 from datetime import datetime, timezone
 from sqlalchemy.future import select
 from app.DB_connection.database import get_db
@@ -19,6 +29,18 @@ from app.models.DBModels import Client
 from app.auth.password_utils import get_password_hash, verify_password
 from app.models.DataModels import ClientCredentials
 from app.utils.console_logger import info, warning, error, debug
+from app.utils.cache_utils import TTLCache
+from app.utils.token_utils import SECRET_KEY_BYTES
+
+# Recently verified logins, keyed by (email, HMAC-SHA256 of the password keyed
+# with the JWT secret) so the cache holds neither plaintext passwords nor
+# unkeyed digests that could be cracked offline
+_auth_cache = TTLCache(ttl=float(os.getenv("AUTH_CACHE_TTL_SECONDS", "60")), maxsize=10_000)
+
+
+def _credentials_key(credentials: ClientCredentials) -> tuple[str, bytes]:
+    """Returns the cache key for an email/password pair."""
+    return credentials.email, hmac.new(SECRET_KEY_BYTES, credentials.password.encode(), hashlib.sha256).digest()
 
 
 async def create_client(credentials: ClientCredentials) -> Client:
@@ -33,12 +55,13 @@ async def create_client(credentials: ClientCredentials) -> Client:
     """
     try:
         info(f"Attempting to create client with email: {credentials.email}", "[ClientManager]")
+        # bcrypt is CPU-bound; hash in a worker thread so the event loop keeps serving
+        # other requests, and before taking a database connection from the pool
+        hashed_password = await asyncio.to_thread(get_password_hash, credentials.password)
         async for db in get_db():
-            hashed_password = get_password_hash(credentials.password)
             new_client = Client(email=credentials.email, password=hashed_password, created_at=datetime.now(timezone.utc))
             db.add(new_client)
             await db.commit()
-            await db.refresh(new_client)
             info(f"Client created successfully with ID: {new_client.id}", "[ClientManager]")
             return new_client
     except Exception as e:
@@ -50,6 +73,10 @@ async def authenticate_client(credentials: ClientCredentials) -> Client | None:
     """
     Authenticates a client by checking their email and password.
     
+    Successful results are cached for AUTH_CACHE_TTL_SECONDS (default: 60), so
+    repeated logins with the same credentials skip the database and bcrypt.
+    Failed attempts are never cached.
+    
     Args:
         credentials (ClientCredentials): The client's email and password.
         
@@ -58,12 +85,22 @@ async def authenticate_client(credentials: ClientCredentials) -> Client | None:
     """
     try:
         info(f"Attempting to authenticate client with email: {credentials.email}", "[ClientManager]")
+        cache_key = _credentials_key(credentials)
+        client = _auth_cache.get(cache_key)
+        if client is not None:
+            info(f"Client authenticated from cache: {client.id}", "[ClientManager]")
+            return client
+
         async for db in get_db():
             result = await db.execute(select(Client).where(Client.email == credentials.email))
             client = result.scalars().first()
-            if client and verify_password(credentials.password, client.password):
-                info(f"Client authenticated successfully: {client.id}", "[ClientManager]")
-                return client
+
+        # Verify after the session is closed so the pooled connection is not held
+        # while bcrypt runs in a worker thread
+        if client and await asyncio.to_thread(verify_password, credentials.password, client.password):
+            info(f"Client authenticated successfully: {client.id}", "[ClientManager]")
+            _auth_cache.set(cache_key, client)
+            return client
         
         warning(f"Failed authentication attempt for email: {credentials.email}", "[ClientManager]")
         return None 
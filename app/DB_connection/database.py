@@ -8,8 +8,8 @@ and consistency.
 
 Key Components:
 - DatabaseManager: A singleton class that initializes and holds the database
-  engine and session factory. It reads connection details from environment
-  variables.
+  engine and session factory. It reads connection details and pool settings
+  from environment variables.
 - get_db: A FastAPI dependency that provides a database session to API endpoints,
   handling session creation, commit, rollback, and closing automatically.
 
@@ -18,7 +18,10 @@ Version: 1.0.0
 """
 
 import os
+import asyncio
 from typing import Optional, AsyncGenerator
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from app.utils.console_logger import info, debug, error
 
@@ -32,6 +35,7 @@ class DatabaseManager:
     _instance: Optional['DatabaseManager'] = None
     _engine = None
     _SessionLocal = None
+    _pool_size = 0
 
     def __new__(cls):
         """
@@ -59,22 +63,67 @@ class DatabaseManager:
             # Construct PostgreSQL URL
             DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
+            # Connection pool settings. LIFO checkout keeps reusing the most recently
+            # returned connections, so surplus ones sit idle and are recycled during
+            # quiet periods instead of every connection being kept warm.
+            self._pool_size = int(os.getenv("DB_POOL_SIZE", "10"))
+            DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+            DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+            DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+            debug(f"DB Pool: size={self._pool_size}, max_overflow={DB_MAX_OVERFLOW}, timeout={DB_POOL_TIMEOUT}, recycle={DB_POOL_RECYCLE}", "[DBManager]")
+
             # Create async engine and session factory
             info("Creating async database engine...", "[DBManager]")
-            self._engine = create_async_engine(DATABASE_URL)
+            self._engine = create_async_engine(
+                DATABASE_URL,
+                poolclass=AsyncAdaptedQueuePool,
+                pool_size=self._pool_size,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT,
+                pool_recycle=DB_POOL_RECYCLE,
+                pool_pre_ping=True,
+                pool_use_lifo=True,
+            )
+            # expire_on_commit=False keeps committed objects usable without a
+            # refresh round-trip; all column defaults are applied client-side.
             self._SessionLocal = async_sessionmaker(
                 autocommit=False,
                 autoflush=False,
+                expire_on_commit=False,
                 bind=self._engine,
                 class_=AsyncSession
             )
             info("DatabaseManager initialized successfully.", "[DBManager]")
 
+    async def warm_pool(self, connections: int) -> None:
+        """
+        Opens the given number of pooled connections up front.
+        
+        Connections are created concurrently and returned to the pool, so the
+        connect/auth handshake happens at startup instead of on the first
+        requests.
+        
+        Args:
+            connections (int): How many connections to open.
+        """
+        async def _warm():
+            async with self._engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+
+        info(f"Warming database pool with {connections} connections...", "[DBManager]")
+        await asyncio.gather(*(_warm() for _ in range(connections)))
+        info("Database pool warmed.", "[DBManager]")
+
     @property
     def engine(self):
         """Provides access to the SQLAlchemy engine instance."""
         return self._engine
 
+    @property
+    def pool_size(self) -> int:
+        """Provides the configured number of persistent pooled connections."""
+        return self._pool_size
+
     @property
     def SessionLocal(self):
         """Provides access to the SQLAlchemy session factory."""
@@ -8,13 +8,21 @@ billing purposes.
 
 Key Functions:
 - initialize_request: Creates a new request record at the start of a request.
+- start_request: Schedules initialize_request in the background and returns
+  the request ID immediately, so the insert overlaps the provider call.
 - finalize_request: Updates the request record with completion details,
-  including token counts, status, and latency.
+  including token counts, status, and latency. Waits for a pending
+  initialization of the same request first.
+- wait_for_pending_requests: Waits for all background initializations,
+  used on application shutdown.
 
 Author: Ramazan Seçilmiş
 Version: 1.0.0
 """
 # Standard library imports
+import asyncio
+from typing import Dict
+from uuid import UUID
 from sqlalchemy import select
 
 
@@ -26,6 +34,10 @@ from app.utils.console_logger import debug, info, warning, error
 
 # Local dataclass definitions have been moved to app.models.DataModels
 
+# Background initializations that have not finished yet, by request ID.
+# Holding the task here also keeps it referenced until it completes.
+_pending_inits: Dict[UUID, "asyncio.Task[UUID]"] = {}
+
 
 async def initialize_request(request: RequestInit):
     """
@@ -42,9 +54,10 @@ async def initialize_request(request: RequestInit):
     """
     async for db in get_db():
         try:
-            debug(f"Initializing request for client: {request.client_id}", "[RequestManager]")
+            debug(lambda: f"Initializing request for client: {request.client_id}", "[RequestManager]")
             # Create the request record
             db_request = Request(
+                id=request.request_id,
                 client_id=request.client_id,  # Always log client_id for basic tracking
                 model_name=request.model_name,  # None if advanced logging is disabled
                 status=None,  # Will be updated by finalize_request
@@ -54,7 +67,6 @@ async def initialize_request(request: RequestInit):
             
             db.add(db_request)
             await db.commit()
-            await db.refresh(db_request)
             info(f"Request initialized with ID: {db_request.id}", "[RequestManager]")
             return db_request.id  # Return the ID so it can be used in finalize_request
 
@@ -63,6 +75,44 @@ async def initialize_request(request: RequestInit):
             error(f"Error initializing request at line {e.__traceback__.tb_lineno}: {e}", "[RequestManager]")
             raise e
 
+
+def _init_done(task: "asyncio.Task[UUID]", request_id: UUID) -> None:
+    """Drops a finished initialization from the pending map and logs failures."""
+    _pending_inits.pop(request_id, None)
+    if not task.cancelled() and task.exception() is not None:
+        error(f"Background initialization failed for request {request_id}: {task.exception()}", "[RequestManager]")
+
+
+def start_request(request: RequestInit) -> UUID:
+    """
+    Starts initializing a request record without waiting for the insert.
+    
+    The request ID is generated client-side, so it can be handed to the
+    provider handler right away while the INSERT runs concurrently.
+    finalize_request waits for the pending insert before updating the row.
+    
+    Args:
+        request (RequestInit): An object containing the initial request data.
+        
+    Returns:
+        UUID: The identifier the request record is being created with.
+    """
+    request_id = request.request_id
+    task = asyncio.create_task(initialize_request(request))
+    _pending_inits[request_id] = task
+    task.add_done_callback(lambda t: _init_done(t, request_id))
+    return request_id
+
+
+async def wait_for_pending_requests() -> None:
+    """
+    Waits for all background request initializations to finish.
+    """
+    if _pending_inits:
+        info(f"Waiting for {len(_pending_inits)} pending request initializations...", "[RequestManager]")
+        await asyncio.gather(*_pending_inits.values(), return_exceptions=True)
+
+
 async def finalize_request(response: RequestFinal):
     """
     Finalizes a request record with completion details.
@@ -73,9 +123,25 @@ async def finalize_request(response: RequestFinal):
     Args:
         response (RequestFinal): An object containing the final request data.
     """
+    pending = _pending_inits.get(response.request_id)
+    if pending is not None:
+        try:
+            # Shielded so a cancelled caller does not cancel the insert as well
+            await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                # The caller itself is being cancelled
+                raise
+            warning(f"Skipping finalization of request {response.request_id}; its initialization was cancelled", "[RequestManager]")
+            return
+        except Exception:
+            # Already logged by the done callback; there is no row to update
+            warning(f"Skipping finalization of request {response.request_id}; it was never initialized", "[RequestManager]")
+            return
+
     async for db in get_db():
         try:
-            debug(f"Finalizing request with ID: {response.request_id}", "[RequestManager]")
+            debug(lambda: f"Finalizing request with ID: {response.request_id}", "[RequestManager]")
             result = await db.execute(select(Request).where(Request.id == response.request_id))
             db_request = result.scalars().first()
             
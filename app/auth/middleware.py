@@ -1,67 +1,167 @@
 """
 Authentication Middleware
 
-This module provides the FastAPI dependency for handling authentication. It
-extracts and verifies the JWT token from the Authorization header to identify
-and authenticate the client for protected endpoints.
+This module handles authentication for the API. An ASGI middleware extracts and
+verifies the JWT token from the Authorization header once per request and stores
+the result on the request state. A thin FastAPI dependency then reads that state
+to identify and authenticate the client for protected endpoints.
 
 Key Components:
-- get_current_client_id: A FastAPI dependency that processes the bearer token,
-  verifies it, and returns the client ID.
+- AuthMiddleware: ASGI middleware that verifies the bearer token, if present,
+  and records the client ID (or the authentication error) on the request state.
+- get_current_client_id: A FastAPI dependency that returns the client ID
+  recorded by AuthMiddleware or raises the recorded 401 error.
+
+Verified tokens are cached in memory for TOKEN_CACHE_TTL_SECONDS (default: 60),
+never past the token's own expiry, so repeat requests with the same bearer token
+skip signature verification. Tokens cannot be revoked before they expire, so
+the cache does not extend what a token can do. Invalid tokens are remembered for
+a few seconds in a separate, smaller cache, so repeated bad tokens are rejected
+without decoding them again and a flood of junk tokens cannot evict valid ones.
 
 Author: Ramazan Seçilmiş
 Version: 1.0.0
 """
-from fastapi import Request, HTTPException, Depends
+import hashlib
+import os
+import time
+from fastapi import Request, HTTPException
+from starlette.types import ASGIApp, Receive, Scope, Send
 from app.utils.token_utils import verify_token
+from app.utils.cache_utils import TTLCache
 from app.utils import console_logger
 
-def get_current_client_id(request: Request) -> str:
+# Token digest -> client_id for verified tokens
+_token_cache = TTLCache(ttl=float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60")), maxsize=50_000)
+# How long an invalid token is remembered
+INVALID_TOKEN_CACHE_SECONDS = 5.0
+# Token digest -> error detail for rejected tokens
+_invalid_token_cache = TTLCache(ttl=INVALID_TOKEN_CACHE_SECONDS, maxsize=1_000)
+
+
+def _token_key(token: str) -> bytes:
+    """Returns a short digest of the token, so cached keys do not hold usable tokens."""
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def _authenticate(auth_header: str | None) -> str:
     """
-    FastAPI dependency to authenticate requests and get the current client ID.
-    
-    This function extracts the JWT token from the "Authorization: Bearer <token>"
-    header, verifies its signature and expiration, and returns the client ID
-    from the token's payload.
-    
+    Verifies an Authorization header value and returns the client ID.
+
     Args:
-        request (Request): The incoming FastAPI request object.
-        
+        auth_header (str | None): The raw "Authorization" header value.
+
     Returns:
         str: The authenticated client's unique identifier.
-        
+
     Raises:
-        HTTPException: 
-            - 401: If the Authorization header is missing, invalid, or the
-                   token is expired or malformed.
+        HTTPException:
+            - 401: If the header is missing or invalid, or the token is
+                   expired or malformed.
     """
     console_logger.info("Processing authentication request", "[Auth]")
-    
-    auth_header = request.headers.get("Authorization")
-    console_logger.debug(f"Authorization header present: {auth_header is not None}", "[Auth]")
-    
+    console_logger.debug(lambda: f"Authorization header present: {auth_header is not None}", "[Auth]")
+
     if not auth_header or not auth_header.startswith("Bearer "):
         console_logger.warning("Missing or invalid authorization header", "[Auth]")
         raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
 
     token = auth_header.split(" ")[1]
     console_logger.debug("Token extracted from header", "[Auth]")
-    
+
+    cache_key = _token_key(token)
+    client_id = _token_cache.get(cache_key)
+    if client_id is not None:
+        console_logger.debug("Token verified from cache", "[Auth]")
+        return client_id
+    cached_error = _invalid_token_cache.get(cache_key)
+    if cached_error is not None:
+        console_logger.warning(f"Rejected cached invalid token: {cached_error}", "[Auth]")
+        # A new exception per request, so no traceback is shared between requests
+        raise HTTPException(status_code=401, detail=cached_error)
+
     try:
         payload = verify_token(token)
         client_id = payload.get("client_id")
-        console_logger.debug(f"Client ID extracted from token: {client_id}", "[Auth]")
-        
+        console_logger.debug(lambda: f"Client ID extracted from token: {client_id}", "[Auth]")
+
         if client_id is None:
             console_logger.error("Invalid token payload: missing client_id", "[Auth]")
             raise HTTPException(status_code=401, detail="Invalid token payload")
-        
+
+        # Never keep a token cached past its own expiry
+        ttl = _token_cache.ttl
+        expires_at = payload.get("exp")
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        if ttl > 0:
+            _token_cache.set(cache_key, client_id, ttl=ttl)
+
         console_logger.info(f"Authentication successful for client: {client_id}", "[Auth]")
         return client_id
     except HTTPException as e:
         console_logger.error(f"Token verification failed: {e.detail}", "[Auth]")
+        _invalid_token_cache.set(cache_key, e.detail)
         # Re-raising the exception from verify_token
         raise e
     except Exception:
         console_logger.error("Unexpected error during authentication", "[Auth]")
-        raise HTTPException(status_code=401, detail="Could not validate credentials") 
\ No newline at end of file
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+
+
+class AuthMiddleware:
+    """
+    ASGI middleware that authenticates bearer tokens once per request.
+
+    For HTTP requests carrying an Authorization header, the token is verified
+    and either `client_id` or `auth_error` is set on the request state. Requests
+    without the header pass through untouched, so public endpoints are not
+    affected; protected endpoints reject them in get_current_client_id.
+
+    This is a plain ASGI middleware rather than a BaseHTTPMiddleware so that
+    streaming responses and background tasks are passed through unchanged.
+    """
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            auth_header = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    auth_header = value.decode("latin-1")
+                    break
+            if auth_header is not None:
+                state = scope.setdefault("state", {})
+                try:
+                    state["client_id"] = _authenticate(auth_header)
+                except HTTPException as e:
+                    state["auth_error"] = e
+        await self.app(scope, receive, send)
+
+
+def get_current_client_id(request: Request) -> str:
+    """
+    FastAPI dependency to get the client ID authenticated by AuthMiddleware.
+
+    Args:
+        request (Request): The incoming FastAPI request object.
+
+    Returns:
+        str: The authenticated client's unique identifier.
+
+    Raises:
+        HTTPException:
+            - 401: If the Authorization header is missing, invalid, or the
+                   token is expired or malformed.
+    """
+    client_id = getattr(request.state, "client_id", None)
+    if client_id is not None:
+        return client_id
+
+    auth_error = getattr(request.state, "auth_error", None)
+    if auth_error is not None:
+        raise auth_error
+
+    console_logger.warning("Missing or invalid authorization header", "[Auth]")
+    raise HTTPException(status_code=401, detail="Missing or invalid authorization header")
@@ -57,6 +57,6 @@ def get_password_hash(password: str) -> str:
     hashed = pwd_context.hash(password)
     
     console_logger.info("Password hashed successfully", "[Password]")
-    console_logger.debug(f"Password hash length: {len(hashed)}", "[Password]")
+    console_logger.debug(lambda: f"Password hash length: {len(hashed)}", "[Password]")
     
     return hashed 
\ No newline at end of file
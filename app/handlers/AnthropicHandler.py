@@ -10,6 +10,7 @@ Key Features:
 - Converts standardized message and tool formats to Anthropic's format
 - Manages API key configuration and client initialization
 - Parses Anthropic's response into a standardized format
+- Marks long system prompts for provider-side prompt caching
 
 Author: Ramazan Seçilmiş
 Version: 1.0.0
@@ -23,8 +24,14 @@ import time
 from uuid import UUID
 from app.models.DataModels import RequestFinal, Response, message, Tool
 from app.DB_connection.request_manager import finalize_request
-import os
 from app.utils.console_logger import info, warning, error, debug
+from app.utils.config import SETTINGS
+from app.utils.http_client import anthropic_http_client
+from app.utils.sse_utils import sse_text, DONE_FRAME
+
+# Anthropic only caches prompt prefixes of at least 1024 tokens. Using ~4 characters
+# per token, shorter system prompts are sent without a cache breakpoint.
+PROMPT_CACHE_MIN_CHARS = 4096
 
 
 class AnthropicHandler(BaseHandler):
@@ -46,8 +53,10 @@ class AnthropicHandler(BaseHandler):
             API_KEY (str): The API key for Anthropic services.
         """
         super().__init__(model_name, generation_config, system_instruction, API_KEY)
-        self.client = AsyncAnthropic(api_key=self.API_KEY)
-        debug(f"Anthropic client initialized for model '{self.model_name}'.", "[AnthropicHandler]")
+        # Shared HTTP client so connections to the API are reused across requests
+        self.client = AsyncAnthropic(api_key=self.API_KEY, http_client=anthropic_http_client())
+        self.system = self._build_system(self.system_instruction)
+        debug(lambda: f"Anthropic client initialized for model '{self.model_name}'.", "[AnthropicHandler]")
 
     async def message_complier(self, messages: list[message]) -> list[Dict[str, str]]:
         """
@@ -67,9 +76,29 @@ class AnthropicHandler(BaseHandler):
             if msg.role.value != "system":  # Anthropic handles system separately
                 formatted_messages.append({"role": msg.role.value, "content": msg.content})
         
-        debug(f"Chat compiled. Total messages: {len(formatted_messages)}", "[AnthropicHandler]")
+        debug(lambda: f"Chat compiled. Total messages: {len(formatted_messages)}", "[AnthropicHandler]")
         return formatted_messages
 
+    @staticmethod
+    def _build_system(system_instruction: Optional[str]) -> Union[str, list[Dict[str, Any]], None]:
+        """
+        Builds the system parameter, adding a prompt-cache breakpoint to long prompts.
+        
+        Rendered system prompts are usually identical across a client's requests,
+        so marking them as cacheable lets Anthropic reuse the processed prefix
+        instead of reading it again on every call.
+        
+        Args:
+            system_instruction (Optional[str]): The rendered system prompt.
+            
+        Returns:
+            Union[str, list[Dict[str, Any]], None]: A cacheable text block list for long
+            prompts, otherwise the prompt unchanged.
+        """
+        if system_instruction and len(system_instruction) >= PROMPT_CACHE_MIN_CHARS:
+            return [{"type": "text", "text": system_instruction, "cache_control": {"type": "ephemeral"}}]
+        return system_instruction
+
     def _convert_tools_to_anthropic_format(self, tools: Optional[list[Tool]]) -> Optional[list[Dict[str, Any]]]:
         """
         Converts standardized Tool objects to the format expected by Anthropic's API.
@@ -123,9 +152,9 @@ class AnthropicHandler(BaseHandler):
         # Convert tools to Anthropic format
         anthropic_tools = self._convert_tools_to_anthropic_format(tools)
         
-        # Get timeout from environment variable (default: 30 seconds)
-        timeout_seconds = int(os.getenv("API_TIMEOUT_SECONDS", "30"))
-        debug(f"Using API timeout: {timeout_seconds} seconds", "[AnthropicHandler]")
+        # Timeout from API_TIMEOUT_SECONDS (default: 30 seconds), read once at startup
+        timeout_seconds = SETTINGS.api_timeout_seconds
+        debug(lambda: f"Using API timeout: {timeout_seconds} seconds", "[AnthropicHandler]")
         
         try:
             debug("Sending request to Anthropic API.", "[AnthropicHandler]")
@@ -135,7 +164,7 @@ class AnthropicHandler(BaseHandler):
             request_params = {
                 "model": self.model_name,
                 "messages": formatted_messages,
-                "system": self.system_instruction,
+                "system": self.system,
                 **self.generation_config
             }
             
@@ -154,9 +183,11 @@ class AnthropicHandler(BaseHandler):
 
             # Standardize the response to match OpenAI format
             result = self.response_parser(response)
-            debug(f"Extracted response content: {result['content'][0]['text'][:100] if result['content'] else 'No content'}...", "[AnthropicHandler]")
+            debug(lambda: f"Extracted response content: {result['content'][0]['text'][:100] if result['content'] else 'No content'}...", "[AnthropicHandler]")
 
-            debug(f"finalizing request for request_id: {request_id}", "[AnthropicHandler]")
+            if response.usage:
+                debug(lambda: f"Prompt cache read tokens: {response.usage.cache_read_input_tokens}", "[AnthropicHandler]")
+            debug(lambda: f"finalizing request for request_id: {request_id}", "[AnthropicHandler]")
             await finalize_request(RequestFinal(
                 request_id=request_id,
                 input_tokens=response.usage.input_tokens if response.usage else None,
@@ -191,16 +222,16 @@ class AnthropicHandler(BaseHandler):
             ))
             raise e
 
-    async def stream_handle(self, messages: list[message], request_id: UUID, tools: Optional[list[Tool]] = None) -> AsyncIterable[Dict[str, Any]]:
+    async def stream_handle(self, messages: list[message], request_id: UUID, tools: Optional[list[Tool]] = None) -> AsyncIterable[bytes]:
         """
         Handles a streaming request to the Anthropic API.
         """
         info(f"Handling streaming request for model: {self.model_name}", "[AnthropicHandler]")
         formatted_messages = await self.message_complier(messages)
             
-        # Get timeout from environment variable (default: 60 seconds for streaming)
-        timeout_seconds = int(os.getenv("API_STREAM_TIMEOUT_SECONDS", "60"))
-        debug(f"Using streaming API timeout: {timeout_seconds} seconds", "[AnthropicHandler]")
+        # Timeout from API_STREAM_TIMEOUT_SECONDS (default: 60 seconds), read once at startup
+        timeout_seconds = SETTINGS.api_stream_timeout_seconds
+        debug(lambda: f"Using streaming API timeout: {timeout_seconds} seconds", "[AnthropicHandler]")
         
         latency = time.time()
         final_message = None
@@ -212,17 +243,19 @@ class AnthropicHandler(BaseHandler):
                 async with self.client.messages.stream(
                     model=self.model_name,
                     messages=formatted_messages,
-                    system=self.system_instruction,
+                    system=self.system,
                     **self.generation_config
                 ) as response_stream:
                     nonlocal latency, final_message
                     latency = time.time() - latency
                     debug("Processing stream chunks...", "[AnthropicHandler]")
                     async for chunk in response_stream.text_stream:
-                        debug(f"Received stream chunk: {chunk[:50]}...", "[AnthropicHandler]")
-                        yield f"data: {chunk}\n\n"
+                        debug(lambda: f"Received stream chunk: {chunk[:50]}...", "[AnthropicHandler]")
+                        yield sse_text(chunk)
                     
                     final_message = await response_stream.get_final_message()
+                    if final_message.usage:
+                        debug(lambda: f"Prompt cache read tokens: {final_message.usage.cache_read_input_tokens}", "[AnthropicHandler]")
 
             async for chunk in await asyncio.wait_for(stream_operation(), timeout=timeout_seconds):
                 yield chunk
@@ -237,7 +270,7 @@ class AnthropicHandler(BaseHandler):
                 status=False,
                 error_message=f"Request timed out after {timeout_seconds} seconds"
             ))
-            yield f"data: Request timed out after {timeout_seconds} seconds\n\n"
+            yield sse_text(f"Request timed out after {timeout_seconds} seconds")
         except Exception as e:
             error(f"An error occurred during stream handle at line {e.__traceback__.tb_lineno}: {e} \nStack trace: {traceback.format_exc()}", "[AnthropicHandler]")
             await finalize_request(RequestFinal(
@@ -246,10 +279,10 @@ class AnthropicHandler(BaseHandler):
                 status=False,
                 error_message=str(e)
             ))
-            yield f"data: An error occurred: {str(e)}\n\n"
+            yield sse_text(f"An error occurred: {str(e)}")
         
         finally:
-            debug(f"finalizing full streaming request for request_id: {request_id}", "[AnthropicHandler]")
+            debug(lambda: f"finalizing full streaming request for request_id: {request_id}", "[AnthropicHandler]")
             await finalize_request(RequestFinal(
                 request_id=request_id,
                 input_tokens=final_message.usage.input_tokens if final_message and final_message.usage else None,
@@ -259,7 +292,8 @@ class AnthropicHandler(BaseHandler):
                 status=True
             ))
             info("Full streaming request finalized successfully.", "[AnthropicHandler]")
-            yield "data: [DONE]\n\n"
+        # Outside the finally block: a generator closed early must not yield again
+        yield DONE_FRAME
 
     @staticmethod
     def get_models() -> list[str]:
@@ -275,7 +309,7 @@ class AnthropicHandler(BaseHandler):
                 "claude-3-sonnet-20240229",
                 "claude-3-haiku-20240307"
             ]
-            debug(f"Found models: {models}", "[AnthropicHandler]")
+            debug(lambda: f"Found models: {models}", "[AnthropicHandler]")
             return models
         except Exception as e:
             error(f"Failed to fetch models for Anthropic: {e}", "[AnthropicHandler]")
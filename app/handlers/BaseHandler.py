@@ -67,7 +67,8 @@ class BaseHandler(ABC):
             tools (Optional[list[Tool]]): A list of function tools available to the model.
             
         Returns:
-            AsyncIterable[bytes]: An async iterable yielding response chunks.
+            AsyncIterable[bytes]: An async iterable yielding encoded SSE frames
+                                  (see app.utils.sse_utils).
         """
         pass
 
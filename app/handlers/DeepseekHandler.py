@@ -25,7 +25,9 @@ from uuid import UUID
 from app.models.DataModels import RequestFinal, Response, message, Tool
 from app.DB_connection.request_manager import finalize_request
 from app.utils.console_logger import info, warning, error, debug
-import os
+from app.utils.config import CONFIG, SETTINGS
+from app.utils.http_client import openai_http_client
+from app.utils.sse_utils import sse_text, sse_json, DONE_FRAME
 
 class DeepseekHandler(BaseHandler):
     """
@@ -46,11 +48,13 @@ class DeepseekHandler(BaseHandler):
             API_KEY (str): The API key for DeepSeek services.
         """
         super().__init__(model_name, generation_config, system_instruction, API_KEY)
+        # Shared HTTP client so connections to the API are reused across requests
         self.client = AsyncOpenAI(
             api_key=self.API_KEY,
-            base_url="https://api.deepseek.com/v1"
+            base_url="https://api.deepseek.com/v1",
+            http_client=openai_http_client()
         )
-        debug(f"Deepseek client initialized for model '{self.model_name}'.", "[DeepseekHandler]")
+        debug(lambda: f"Deepseek client initialized for model '{self.model_name}'.", "[DeepseekHandler]")
 
     async def message_complier(self, messages: list[message]) -> list[Dict[str, str]]:
         """
@@ -73,7 +77,7 @@ class DeepseekHandler(BaseHandler):
         for msg in messages:
             formatted_messages.append({"role": msg.role.value, "content": msg.content})
         
-        debug(f"Chat compiled. Total messages: {len(formatted_messages)}", "[DeepSeekHandler]")
+        debug(lambda: f"Chat compiled. Total messages: {len(formatted_messages)}", "[DeepSeekHandler]")
         return formatted_messages
 
     async def response_parser(self, response: Dict[str, Any]) -> Response:
@@ -100,9 +104,9 @@ class DeepseekHandler(BaseHandler):
         info(f"Handling synchronous request for model: {self.model_name}", "[DeepSeekHandler]")
         formatted_messages = await self.message_complier(messages)
         
-        # Get timeout from environment variable (default: 30 seconds)
-        timeout_seconds = int(os.getenv("API_TIMEOUT_SECONDS", "30"))
-        debug(f"Using API timeout: {timeout_seconds} seconds", "[DeepSeekHandler]")
+        # Timeout from API_TIMEOUT_SECONDS (default: 30 seconds), read once at startup
+        timeout_seconds = SETTINGS.api_timeout_seconds
+        debug(lambda: f"Using API timeout: {timeout_seconds} seconds", "[DeepSeekHandler]")
         
         try:
             debug("Sending request to DeepSeek API.", "[DeepSeekHandler]")
@@ -125,7 +129,7 @@ class DeepseekHandler(BaseHandler):
 
             result = await self.response_parser(response)
 
-            debug(f"finalizing request for request_id: {request_id}", "[DeepSeekHandler]")
+            debug(lambda: f"finalizing request for request_id: {request_id}", "[DeepSeekHandler]")
             await finalize_request(RequestFinal(
                 request_id=request_id,
                 input_tokens=response.usage.input_tokens if response.usage else None,
@@ -160,16 +164,16 @@ class DeepseekHandler(BaseHandler):
             ))
             raise e
         
-    async def stream_handle(self, messages: list[message], request_id: UUID, tools: Optional[list[Tool]] = None) -> AsyncIterable[Dict[str, Any]]:
+    async def stream_handle(self, messages: list[message], request_id: UUID, tools: Optional[list[Tool]] = None) -> AsyncIterable[bytes]:
         """
         Handles a streaming request to the DeepSeek API.
         """
         info(f"Handling streaming request for model: {self.model_name}", "[DeepSeekHandler]")
         formatted_messages = await self.message_complier(messages)
 
-        # Get timeout from environment variable (default: 60 seconds for streaming)
-        timeout_seconds = int(os.getenv("API_STREAM_TIMEOUT_SECONDS", "60"))
-        debug(f"Using streaming API timeout: {timeout_seconds} seconds", "[DeepSeekHandler]")
+        # Timeout from API_STREAM_TIMEOUT_SECONDS (default: 60 seconds), read once at startup
+        timeout_seconds = SETTINGS.api_stream_timeout_seconds
+        debug(lambda: f"Using streaming API timeout: {timeout_seconds} seconds", "[DeepSeekHandler]")
 
         full_response = ""
         latency = time.time()
@@ -200,8 +204,8 @@ class DeepseekHandler(BaseHandler):
                 if delta.content:
                     content = delta.content
                     full_response += content
-                    debug(f"Received stream chunk: {content[:50]}...", "[DeepSeekHandler]")
-                    yield f"data: {content}\n\n"
+                    debug(lambda: f"Received stream chunk: {content[:50]}...", "[DeepSeekHandler]")
+                    yield sse_text(content)
                 
                 # Handle tool calls
                 if delta.tool_calls:
@@ -223,7 +227,7 @@ class DeepseekHandler(BaseHandler):
                             tool_calls_buffer[tool_call.index]["function"]["arguments"] += tool_call.function.arguments
                     
                     # Yield tool call data in a structured format
-                    yield f"data: {{'tool_calls': {tool_calls_buffer}}}\n\n"
+                    yield sse_json({"tool_calls": tool_calls_buffer})
             
             info("Streaming finished.", "[DeepSeekHandler]")
 
@@ -235,7 +239,7 @@ class DeepseekHandler(BaseHandler):
                 status=False,
                 error_message=f"Request timed out after {timeout_seconds} seconds"
             ))
-            yield f"data: Request timed out after {timeout_seconds} seconds\n\n"
+            yield sse_text(f"Request timed out after {timeout_seconds} seconds")
         except Exception as e:
             error(f"An error occurred during stream handle at line {e.__traceback__.tb_lineno}: {e} \nStack trace: {traceback.format_exc()}", "[DeepSeekHandler]")
             await finalize_request(RequestFinal(
@@ -244,10 +248,10 @@ class DeepseekHandler(BaseHandler):
                 status=False,
                 error_message=str(e)
             ))
-            yield f"data: An error occurred: {str(e)}\n\n"
+            yield sse_text(f"An error occurred: {str(e)}")
         
         finally:
-            debug(f"finalizing full streaming request for request_id: {request_id}", "[DeepSeekHandler]")
+            debug(lambda: f"finalizing full streaming request for request_id: {request_id}", "[DeepSeekHandler]")
             await finalize_request(RequestFinal(
                 request_id=request_id,
                 input_tokens=None,  # Token counts not available in streaming for DeepSeek
@@ -257,7 +261,8 @@ class DeepseekHandler(BaseHandler):
                 status=True
             ))
             info("Full streaming request finalized successfully.", "[DeepSeekHandler]")
-            yield "data: [DONE]\n\n"
+        # Outside the finally block: a generator closed early must not yield again
+        yield DONE_FRAME
 
     @staticmethod
     def get_models() -> list[str]:
@@ -267,9 +272,9 @@ class DeepseekHandler(BaseHandler):
         debug("Fetching available models for Deepseek.", "[DeepseekHandler]")
         try:
             client = OpenAI(base_url="https://api.deepseek.com/v1",
-                            api_key=os.getenv("DEEPSEEK_API_KEY"))
+                            api_key=CONFIG.deepseek_api_key)
             models = [model.id for model in client.models.list()]
-            debug(f"Found models: {models}", "[DeepseekHandler]")
+            debug(lambda: f"Found models: {models}", "[DeepseekHandler]")
             return models
         except Exception as e:
             error(f"Failed to fetch models from Deepseek: {e}", "[DeepseekHandler]")
@@ -22,13 +22,14 @@ import google.generativeai as genai
 from typing import Dict, Any, AsyncIterable
 from uuid import UUID
 import asyncio
-import os
 from app.handlers.BaseHandler import BaseHandler
 from app.DB_connection.request_manager import finalize_request
 from app.models.DataModels import RequestFinal, Response, message, Tool  
 from typing import Optional
 from app.utils.console_logger import info, warning, error, debug
-import json
+from app.utils.config import SETTINGS
+from app.utils.sse_utils import sse_text, sse_json, DONE_FRAME
+import orjson
 
 class GoogleHandler(BaseHandler):
     """
@@ -62,7 +63,7 @@ class GoogleHandler(BaseHandler):
             generation_config=self.generation_config,
             system_instruction=validated_system_instruction
         )
-        debug(f"Google AI model '{self.model_name}' initialized.", "[GoogleHandler]")
+        debug(lambda: f"Google AI model '{self.model_name}' initialized.", "[GoogleHandler]")
 
     async def message_complier(self, messages: list[message]) -> list[Dict[str, str]]:
         """
@@ -81,7 +82,7 @@ class GoogleHandler(BaseHandler):
                 warning(f"Skipping empty message with role: {message.role.value}", "[GoogleHandler]")
                 continue
             history.append({'role': 'model' if message.role.value=='assistant' else message.role.value, 'parts': [message.content]})
-        debug(f"Chat compiled. Total messages: {len(history)}", "[GoogleHandler]")
+        debug(lambda: f"Chat compiled. Total messages: {len(history)}", "[GoogleHandler]")
         return history
 
     async def response_parser(self, response) -> Response:
@@ -110,9 +111,9 @@ class GoogleHandler(BaseHandler):
         info(f"Handling synchronous request for model: {self.model_name}", "[GoogleHandler]")
         Provider_messages = await self.message_complier(messages)
         
-        # Get timeout from environment variable (default: 30 seconds)
-        timeout_seconds = int(os.getenv("API_TIMEOUT_SECONDS", "30"))
-        debug(f"Using API timeout: {timeout_seconds} seconds", "[GoogleHandler]")
+        # Timeout from API_TIMEOUT_SECONDS (default: 30 seconds), read once at startup
+        timeout_seconds = SETTINGS.api_timeout_seconds
+        debug(lambda: f"Using API timeout: {timeout_seconds} seconds", "[GoogleHandler]")
         
         try:
             debug("Sending request to Google API.", "[GoogleHandler]")
@@ -146,7 +147,7 @@ class GoogleHandler(BaseHandler):
             latency = time.time() - latency
                 
 
-            debug(f"finalizing request for request_id: {request_id}", "[GoogleHandler]")
+            debug(lambda: f"finalizing request for request_id: {request_id}", "[GoogleHandler]")
             await finalize_request(RequestFinal(
                 request_id=request_id, 
                 input_tokens=response.usage_metadata.prompt_token_count if response.usage_metadata else None,
@@ -177,16 +178,16 @@ class GoogleHandler(BaseHandler):
                 error_message=str(e)
             ))
             raise e
-    async def stream_handle(self, messages: list[message], request_id: UUID, tools: Optional[list[Tool]] = None) -> AsyncIterable[Dict[str, Any]]:
+    async def stream_handle(self, messages: list[message], request_id: UUID, tools: Optional[list[Tool]] = None) -> AsyncIterable[bytes]:
         """
         Handles a streaming request to the Google AI API.
         """
         info(f"Handling streaming request for model: {self.model_name}", "[GoogleHandler]")
         Provider_messages = await self.message_complier(messages)
 
-        # Get timeout from environment variable (default: 60 seconds for streaming)
-        timeout_seconds = int(os.getenv("API_STREAM_TIMEOUT_SECONDS", "60"))
-        debug(f"Using streaming API timeout: {timeout_seconds} seconds", "[GoogleHandler]")
+        # Timeout from API_STREAM_TIMEOUT_SECONDS (default: 60 seconds), read once at startup
+        timeout_seconds = SETTINGS.api_stream_timeout_seconds
+        debug(lambda: f"Using streaming API timeout: {timeout_seconds} seconds", "[GoogleHandler]")
 
         latency = time.time()
         first_chunk_received = False
@@ -227,8 +228,8 @@ class GoogleHandler(BaseHandler):
                     for part in chunk.parts:
                         if hasattr(part, 'text') and part.text:
                             # Handle text content
-                            debug(f"Received stream chunk: {part.text[:50]}...", "[GoogleHandler]")
-                            yield f"data: {part.text}\n\n"
+                            debug(lambda: f"Received stream chunk: {part.text[:50]}...", "[GoogleHandler]")
+                            yield sse_text(part.text)
                         elif hasattr(part, 'function_call') and part.function_call:
                             # Handle function calls
                             tool_calls_data = {
@@ -237,12 +238,12 @@ class GoogleHandler(BaseHandler):
                                     "type": "function",
                                     "function": {
                                         "name": part.function_call.name,
-                                        "arguments": json.dumps(dict(part.function_call.args)) if part.function_call.args else "{}"
+                                        "arguments": orjson.dumps(dict(part.function_call.args)).decode() if part.function_call.args else "{}"
                                     }
                                 }]
                             }
-                            debug(f"Received function call: {part.function_call.name}", "[GoogleHandler]")
-                            yield f"data: {json.dumps(tool_calls_data)}\n\n"
+                            debug(lambda: f"Received function call: {part.function_call.name}", "[GoogleHandler]")
+                            yield sse_json(tool_calls_data)
                 else:
                     warning("Received an empty or invalid chunk in stream.", "[GoogleHandler]")
                 response = chunk  # Keep the last chunk to get usage metadata
@@ -257,7 +258,7 @@ class GoogleHandler(BaseHandler):
                 status=False,
                 error_message=f"Request timed out after {timeout_seconds} seconds"
             ))
-            yield f"data: Request timed out after {timeout_seconds} seconds\n\n"
+            yield sse_text(f"Request timed out after {timeout_seconds} seconds")
         except Exception as e:
             error(f"An error occurred during stream handle at line {e.__traceback__.tb_lineno}: {e} \nStack trace: {traceback.format_exc()}", "[GoogleHandler]")
             await finalize_request(RequestFinal(
@@ -266,10 +267,10 @@ class GoogleHandler(BaseHandler):
                 status=False,
                 error_message=str(e)
             ))
-            yield f"data: An error occurred: {str(e)}\n\n"
+            yield sse_text(f"An error occurred: {str(e)}")
         
         finally:
-            debug(f"finalizing full streaming request for request_id: {request_id}", "[GoogleHandler]")
+            debug(lambda: f"finalizing full streaming request for request_id: {request_id}", "[GoogleHandler]")
             await finalize_request(RequestFinal(
                 request_id=request_id,
                 input_tokens=response.usage_metadata.prompt_token_count if hasattr(response, 'usage_metadata') and response.usage_metadata else None,
@@ -279,7 +280,8 @@ class GoogleHandler(BaseHandler):
                 status=True
             ))
             info("Full streaming request finalized successfully.", "[GoogleHandler]")
-            yield "data: [DONE]\n\n"
+        # Outside the finally block: a generator closed early must not yield again
+        yield DONE_FRAME
 
     @staticmethod
     def get_models() -> list[str]:
@@ -290,7 +292,7 @@ class GoogleHandler(BaseHandler):
         try:
             models_info = genai.list_models()
             model_names = [m.name.split('/')[-1] for m in models_info if 'generateContent' in m.supported_generation_methods]
-            debug(f"Found models: {model_names}", "[GoogleHandler]")
+            debug(lambda: f"Found models: {model_names}", "[GoogleHandler]")
             return model_names
         except Exception as e:
             error(f"Failed to fetch models from Google: {e}", "[GoogleHandler]")
@@ -3,13 +3,15 @@ from openai import AsyncOpenAI, OpenAI
 from app.handlers.BaseHandler import BaseHandler
 import asyncio
 import time
-import os
 import traceback
 import json
 from uuid import UUID
 from app.models.DataModels import RequestFinal, Response, Tool, message
 from app.DB_connection.request_manager import finalize_request
 from app.utils.console_logger import info, warning, error, debug
+from app.utils.config import SETTINGS
+from app.utils.http_client import openai_http_client
+from app.utils.sse_utils import sse_text, sse_json, DONE_FRAME
 
 
 class OpenAIHandler(BaseHandler):
@@ -19,8 +21,9 @@ class OpenAIHandler(BaseHandler):
 
     def __init__(self, model_name: str, generation_config: Dict[str, Any], system_instruction: Optional[str], API_KEY: str):
         super().__init__(model_name, generation_config, system_instruction, API_KEY)
-        self.client = AsyncOpenAI(api_key=self.API_KEY)
-        debug(f"OpenAI client initialized for model '{self.model_name}'.", "[OpenAIHandler]")
+        # Shared HTTP client so connections to the API are reused across requests
+        self.client = AsyncOpenAI(api_key=self.API_KEY, http_client=openai_http_client())
+        debug(lambda: f"OpenAI client initialized for model '{self.model_name}'.", "[OpenAIHandler]")
 
     async def message_complier(self, messages: list[message]) -> list[Dict[str, str]]:
         """
@@ -37,7 +40,7 @@ class OpenAIHandler(BaseHandler):
         for msg in messages:
             formatted_messages.append({"role": msg.role.value, "content": msg.content})
         
-        debug(f"Chat compiled. Total messages: {len(formatted_messages)}", "[OpenAIHandler]")
+        debug(lambda: f"Chat compiled. Total messages: {len(formatted_messages)}", "[OpenAIHandler]")
         return formatted_messages
 
     async def response_parser(self, response: Dict[str, Any]) -> Response:
@@ -66,9 +69,9 @@ class OpenAIHandler(BaseHandler):
         info(f"Handling synchronous request for model: {self.model_name}", "[OpenAIHandler]")
         formatted_messages = await self.message_complier(messages)
         
-        # Get timeout from environment variable (default: 30 seconds)
-        timeout_seconds = int(os.getenv("API_TIMEOUT_SECONDS", "30"))
-        debug(f"Using API timeout: {timeout_seconds} seconds", "[OpenAIHandler]")
+        # Timeout from API_TIMEOUT_SECONDS (default: 30 seconds), read once at startup
+        timeout_seconds = SETTINGS.api_timeout_seconds
+        debug(lambda: f"Using API timeout: {timeout_seconds} seconds", "[OpenAIHandler]")
         
         try:
             debug("Sending request to OpenAI API.", "[OpenAIHandler]")
@@ -89,7 +92,7 @@ class OpenAIHandler(BaseHandler):
             debug("Received synchronous response from API.", "[OpenAIHandler]")
 
 
-            debug(f"finalizing request for request_id: {request_id}", "[OpenAIHandler]")
+            debug(lambda: f"finalizing request for request_id: {request_id}", "[OpenAIHandler]")
             await finalize_request(RequestFinal(
                 request_id=request_id,
                 input_tokens=response.usage.input_tokens if response.usage else None,
@@ -99,7 +102,7 @@ class OpenAIHandler(BaseHandler):
                 status=response.status == "completed"
             ))
             info("Synchronous request finalized successfully.", "[OpenAIHandler]")
-            debug(f"response.output[0]: {response.output[0]}", "[OpenAIHandler]")
+            debug(lambda: f"response.output[0]: {response.output[0]}", "[OpenAIHandler]")
             
             # Check the type of the output directly
             if hasattr(response.output[0], 'type') and response.output[0].type == 'function_call':
@@ -138,16 +141,16 @@ class OpenAIHandler(BaseHandler):
             ))
             return Response(type="error", error=str(e))
         
-    async def stream_handle(self, messages: list[message], request_id: UUID, tools: Optional[list[Tool]] = None) -> AsyncIterable[Dict[str, Any]]:
+    async def stream_handle(self, messages: list[message], request_id: UUID, tools: Optional[list[Tool]] = None) -> AsyncIterable[bytes]:
         """
         Handles a streaming request.
         """
         info(f"Handling streaming request for model: {self.model_name}", "[OpenAIHandler]")
         formatted_messages = await self.message_complier(messages)
 
-        # Get timeout from environment variable (default: 60 seconds for streaming)
-        timeout_seconds = int(os.getenv("API_STREAM_TIMEOUT_SECONDS", "60"))
-        debug(f"Using streaming API timeout: {timeout_seconds} seconds", "[OpenAIHandler]")
+        # Timeout from API_STREAM_TIMEOUT_SECONDS (default: 60 seconds), read once at startup
+        timeout_seconds = SETTINGS.api_stream_timeout_seconds
+        debug(lambda: f"Using streaming API timeout: {timeout_seconds} seconds", "[OpenAIHandler]")
 
         full_response = ""
         latency = time.time()
@@ -171,13 +174,13 @@ class OpenAIHandler(BaseHandler):
             latency = time.time() - latency
             
             debug("Processing stream chunks...", "[OpenAIHandler]")
-            debug(f"Response stream object type: {type(response_stream)}", "[OpenAIHandler]")
+            debug(lambda: f"Response stream object type: {type(response_stream)}", "[OpenAIHandler]")
             
             # Keep track of function calls being built
             current_function_calls = {}
             
             async for chunk in response_stream:
-                debug(f"Received chunk type: {chunk.type}, content: {chunk}", "[OpenAIHandler]")
+                debug(lambda: f"Received chunk type: {chunk.type}, content: {chunk}", "[OpenAIHandler]")
                 
                 # Handle function call argument streaming
                 if chunk.type == "response.function_call_arguments.delta":
@@ -196,13 +199,13 @@ class OpenAIHandler(BaseHandler):
                                 "arguments": chunk.arguments
                             }
                         }
-                        yield f"data: {{'tool_calls': [{tool_call}]}}\n\n"
+                        yield sse_json({"tool_calls": [tool_call]})
                 
                 # Handle regular content streaming
                 elif chunk.type == "response.output_text.delta":
                     content = chunk.delta
-                    debug(f"Received content chunk: {content[:50]}...", "[OpenAIHandler]")
-                    yield f"data: {content}\n\n"
+                    debug(lambda: f"Received content chunk: {content[:50]}...", "[OpenAIHandler]")
+                    yield sse_text(content)
                 
                 # Handle initial function call setup
                 elif chunk.type == "response.output_item.added":
@@ -222,7 +225,7 @@ class OpenAIHandler(BaseHandler):
                 status=False,
                 error_message=f"Request timed out after {timeout_seconds} seconds"
             ))
-            yield f"data: An error occurred: {f'Request timed out after {timeout_seconds} seconds'}\n\n"
+            yield sse_text(f"An error occurred: Request timed out after {timeout_seconds} seconds")
 
         except Exception as e:
             error(f"An error occurred during stream handle at line {e.__traceback__.tb_lineno}: {e} \nStack trace: {traceback.format_exc()}", "[OpenAIHandler]")
@@ -232,10 +235,10 @@ class OpenAIHandler(BaseHandler):
                 status=False,
                 error_message=str(e)
             ))
-            yield f"data: An error occurred: {str(e)}\n\n"
+            yield sse_text(f"An error occurred: {str(e)}")
         
         finally:
-            debug(f"finalizing full streaming request for request_id: {request_id}", "[OpenAIHandler]")
+            debug(lambda: f"finalizing full streaming request for request_id: {request_id}", "[OpenAIHandler]")
             await finalize_request(RequestFinal(
                 request_id=request_id,
                 input_tokens=None,  # Token counts not available in streaming for OpenAI
@@ -245,7 +248,8 @@ class OpenAIHandler(BaseHandler):
                 status=True
             ))
             info("Full streaming request finalized successfully.", "[OpenAIHandler]")
-            yield "data: [DONE]\n\n"
+        # Outside the finally block: a generator closed early must not yield again
+        yield DONE_FRAME
 
     @staticmethod
     def get_models() -> list[str]:
@@ -258,7 +262,7 @@ class OpenAIHandler(BaseHandler):
         try:
             client = OpenAI()
             models = [model.id for model in client.models.list()]
-            debug(f"Found models: {models}", "[OpenAIHandler]")
+            debug(lambda: f"Found models: {models}", "[OpenAIHandler]")
             return models
         except Exception as e:
             error(f"Failed to fetch models from OpenAI, will send default list. error: {e}", "[OpenAIHandler]")
@@ -17,16 +17,22 @@ Version: 1.0.0
 from __future__ import annotations
 from datetime import datetime
 from typing import Any, Dict, Optional, Literal
-from uuid import UUID
+from uuid import UUID, uuid4
 from pydantic import BaseModel, Field
 
 from app.models.DBModels import Role, Provider
 
+# Model identifiers as used by the providers, e.g. "gpt-4o", "models/gemini-1.5-pro",
+# "ft:gpt-4o-mini:org::id" or "claude-3-5-sonnet@20240620". Checked by pydantic-core's
+# linear-time regex engine, so unusual input cannot cause backtracking.
+MODEL_NAME_PATTERN = r"^[A-Za-z0-9._:/@-]{1,128}$"
+
 
 class RequestInit(BaseModel):
     """
     Model for initializing a request in the database.
     """
+    request_id: UUID = Field(default_factory=uuid4)
     client_id: UUID
     model_name: str 
     created_at: datetime
@@ -58,7 +64,7 @@ class BaseAPIRequest(BaseModel):
     Base model for all AI generation API requests.
     """
     provider: Provider
-    model: str
+    model: str = Field(pattern=MODEL_NAME_PATTERN)
     tools: Optional[list[Tool]] = None
     systemPrompt: SystemPrompt
     parameters: Dict[str, Any] = Field(default_factory=dict)
@@ -67,6 +73,9 @@ class BaseAPIRequest(BaseModel):
 class GenerateRequest(BaseAPIRequest):
     """
     Model for one-shot generation requests (/api/generate).
+    
+    There is no chat_id field; extra keys sent by clients are ignored, so a
+    one-shot request never carries chat state.
     """
     messages: list[message]
 
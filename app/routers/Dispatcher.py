@@ -25,7 +25,7 @@ handler class that implements the BaseHandler interface. This allows for:
 Workflow:
 1. Receive GenerateRequest from API endpoint
 2. Validate and retrieve appropriate handler for provider
-3. Initialize request tracking in database
+3. Start request tracking in database (runs in the background)
 4. Retrieve client API key or fall back to system key
 5. Render prompt template with variable substitution
 6. Create handler instance with configuration
@@ -36,7 +36,9 @@ Author: Ramazan Seçilmiş
 Version: 1.0.0
 """
 
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Any
 from app.DB_connection.PromptTemplate_manager import get_rendered_prompt
 from app.handlers.GoogleHandler import GoogleHandler
 from app.handlers.OpenAIHandler import OpenAIHandler
@@ -44,7 +46,7 @@ from app.handlers.AnthropicHandler import AnthropicHandler
 from app.handlers.DeepseekHandler import DeepseekHandler
 from app.models.DataModels import RequestInit, GenerateRequest, Response
 from app.models.DBModels import Provider
-from app.DB_connection.request_manager import initialize_request
+from app.DB_connection.request_manager import start_request
 from app.utils.console_logger import info, error, debug
 from app.DB_connection.api_manager import get_api_key
 
@@ -56,7 +58,21 @@ HANDLERS = {
     Provider.deepseek: DeepseekHandler,
 }
 
-async def dispatch_request(request: GenerateRequest, client_id: str):
+@dataclass
+class DispatchResult:
+    """
+    Result of dispatching a request to a provider handler.
+    
+    Attributes:
+        stream (bool): True if body is an async iterable of response chunks,
+                       False if it is a complete Response object.
+        body (Any): The handler's streaming iterator or its Response.
+    """
+    stream: bool
+    body: Any
+
+
+async def dispatch_request(request: GenerateRequest, client_id: str) -> DispatchResult:
     """
     Dispatch an AI generation request to the appropriate provider handler.
     
@@ -87,9 +103,9 @@ async def dispatch_request(request: GenerateRequest, client_id: str):
                         and request tracking
     
     Returns:
-        Union[AsyncIterable[bytes], str, dict]: Response format depends on stream parameter:
-            - For streaming: AsyncIterable[bytes] yielding response chunks
-            - For non-streaming: str or dict containing the complete response
+        DispatchResult: The handler output tagged with the response mode:
+            - For streaming: stream=True, body is an AsyncIterable yielding response chunks
+            - For non-streaming: stream=False, body is the complete Response
     
     Raises:
         ValueError: If the specified provider is not supported or not found in HANDLERS
@@ -110,7 +126,7 @@ async def dispatch_request(request: GenerateRequest, client_id: str):
             systemPrompt={"template_name": "default", "tenants": {}},
             stream=False
         )
-        response = await dispatch_request(request, "client-uuid")
+        result = await dispatch_request(request, "client-uuid")
         ```
     
     Note:
@@ -120,32 +136,36 @@ async def dispatch_request(request: GenerateRequest, client_id: str):
     """
     try:
         info(f"Dispatching request for provider: {request.provider.value}", "[Dispatcher]")
-        debug(f"Client ID: {client_id}, Model: {request.model}", "[Dispatcher]")
+        debug(lambda: f"Client ID: {client_id}, Model: {request.model}", "[Dispatcher]")
         
-        handler_class = HANDLERS.get(request.provider)
-        if not handler_class:
+        # Pydantic has already validated request.provider as a Provider, so the
+        # lookup only fails if a provider is missing from HANDLERS
+        try:
+            handler_class = HANDLERS[request.provider]
+        except KeyError:
             error(f"Provider '{request.provider.value}' not found in handlers", "[Dispatcher]")
             raise ValueError(f"Provider '{request.provider.value}' is not supported.")
 
-        debug(f"Found handler class: {handler_class.__name__}", "[Dispatcher]")
+        debug(lambda: f"Found handler class: {handler_class.__name__}", "[Dispatcher]")
 
         api_key, is_client_api = await get_api_key(request.provider.value, client_id)
 
-        # Initialize the request and await it immediately
+        # Insert the request record in the background; the ID is generated up front
+        # and finalize_request waits for the insert before updating the row
         debug("Initializing request in database...", "[Dispatcher]")
-        request_id = await initialize_request(RequestInit(
+        request_id = start_request(RequestInit(
             client_id=client_id,
             model_name=request.model,
             provider=request.provider,
             is_client_api=is_client_api,
             created_at=datetime.now()
         ))
-        info(f"Request initialized with ID: {request_id}", "[Dispatcher]")
+        info(f"Request initialization started with ID: {request_id}", "[Dispatcher]")
 
         # Get the rendered prompt and await it
         debug("Getting rendered prompt...", "[Dispatcher]")
         system_instruction = await get_rendered_prompt(request.systemPrompt)
-        debug(f"Rendered system instruction (first 100 chars): {str(system_instruction)[:100]}...", "[Dispatcher]")
+        debug(lambda: f"Rendered system instruction (first 100 chars): {str(system_instruction)[:100]}...", "[Dispatcher]")
         
         debug("Creating handler instance...", "[Dispatcher]")
         handler_instance = handler_class(
@@ -154,15 +174,15 @@ async def dispatch_request(request: GenerateRequest, client_id: str):
             system_instruction=system_instruction,
             API_KEY=api_key
         )
-        debug(f"Handler instance created: {type(handler_instance).__name__}", "[Dispatcher]")
+        debug(lambda: f"Handler instance created: {type(handler_instance).__name__}", "[Dispatcher]")
 
         if request.stream:
             info("Calling stream_handle for streaming response", "[Dispatcher]")
-            return handler_instance.stream_handle(
+            return DispatchResult(stream=True, body=handler_instance.stream_handle(
                 messages=request.messages,
                 request_id=request_id,
                 tools=request.tools
-            )
+            ))
         else:
             info("Calling sync_handle for non-streaming response", "[Dispatcher]")
             result = await handler_instance.sync_handle(
@@ -170,8 +190,8 @@ async def dispatch_request(request: GenerateRequest, client_id: str):
                 request_id=request_id,
                 tools=request.tools
             )
-            debug(f"Handler returned result of type {type(result)}", "[Dispatcher]")
-            return result
+            debug(lambda: f"Handler returned result of type {type(result)}", "[Dispatcher]")
+            return DispatchResult(stream=False, body=result)
     except Exception as e:
         error(f"Error dispatching request at line {e.__traceback__.tb_lineno}: {e}", "[Dispatcher]")
         raise e
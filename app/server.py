@@ -16,6 +16,7 @@ Key Features:
 - Comprehensive logging and error handling
 
 Main Endpoints:
+- /: Health check for load balancers and liveness probes
 - /api/generate: One-shot text generation
 - /api/chat: Conversational chat with history
 - /api/models/{provider}: Get available models for a provider
@@ -43,11 +44,14 @@ Author: Ramazan Seçilmiş
 Version: 1.0.0
 """
 
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Response
 from fastapi.responses import StreamingResponse
-from dotenv import load_dotenv
+from fastapi.concurrency import run_in_threadpool
 import os
-from typing import AsyncIterable
+import asyncio
+import contextlib
+import functools
+import orjson
 from contextlib import asynccontextmanager
 from datetime import timedelta
 
@@ -56,16 +60,23 @@ from sqlalchemy.exc import IntegrityError
 from app.models.DBModels import Provider
 from app.routers.Dispatcher import HANDLERS, dispatch_request
 from app.models.DataModels import GenerateRequest, ChatRequest, ClientCredentials, PromptTemplateCreate, message, APIKeyCreate, APIKeyUpdate
-from app.DB_connection.chat_manager import create_chat, chat_history, add_message
+from app.DB_connection.chat_manager import prepare_chat_turn, store_chat_turn, queue_message, message_writer, MESSAGE_QUEUE_SIZE
+from app.DB_connection.request_manager import wait_for_pending_requests
 from app.DB_connection.client_manager import create_client, authenticate_client
 from app.DB_connection.PromptTemplate_manager import create_prompt_template, update_prompt_template
 from app.DB_connection.api_manager import store_api_key, delete_api_key, update_api_key
 from app.utils.token_utils import create_token
-from app.auth.middleware import get_current_client_id
+from app.utils.config import CONFIG, PROVIDER_ENVS
+from app.utils.api_key_utils import mask_api_key
+from app.utils.responses import ORJSONResponse
+from app.utils.cache_utils import TTLCache
+from app.utils.http_client import close_http_clients
+from app.utils.stream_utils import release_on_close
+from app.auth.middleware import AuthMiddleware, get_current_client_id
 from app.utils.console_logger import info, warning, error, debug
 
-# Load environment variables from a .env file if it exists
-load_dotenv()
+# Seconds shutdown waits for queued chat messages to be written
+_MESSAGE_FLUSH_TIMEOUT = float(os.getenv("MESSAGE_FLUSH_TIMEOUT_SECONDS", "10"))
 
 
 @asynccontextmanager
@@ -79,9 +90,14 @@ async def lifespan(app: FastAPI):
     
     Startup Tasks:
     - Initialize database connection and verify connectivity
+    - Pre-open pooled database connections
     - Check for provider API keys and log warnings if missing
+    - Start the background message writer
     
     Shutdown Tasks:
+    - Flush pending message writes (up to MESSAGE_FLUSH_TIMEOUT_SECONDS) and stop the writer
+    - Wait for pending request record inserts
+    - Close the shared provider HTTP clients
     - Close database connections gracefully
     - Dispose of database engine resources
     
@@ -103,6 +119,8 @@ async def lifespan(app: FastAPI):
         # Access engine to trigger initialization
         if db_manager.engine is None:
             raise ValueError("Failed to initialize database connection")
+        # Warm the persistent part of the pool unless a different count is configured
+        await db_manager.warm_pool(int(os.getenv("DB_POOL_WARM_CONNECTIONS", db_manager.pool_size)))
         info("Database connection established successfully", "[DB]")
     except Exception as e:
         error(f"Error initializing database: {e}", "[DB]")
@@ -110,21 +128,34 @@ async def lifespan(app: FastAPI):
 
 
     # Check if all provider API keys are set
-    if not os.getenv("GOOGLE_API_KEY"):
-        warning("GOOGLE_API_KEY environment variable not set.", "[Config]")
+    for provider, name in PROVIDER_ENVS.items():
+        if CONFIG.api_key(provider) is None:
+            warning(f"{name} environment variable not set; {provider} requests need a client API key.", "[Config]")
 
-    if not os.getenv("OPENAI_API_KEY"):
-        warning("OPENAI_API_KEY environment variable not set.", "[Config]")
+    # Per-provider concurrency limits, see _acquire_provider_slot
+    app.state.provider_slots = {provider: asyncio.Semaphore(_PROVIDER_MAX_CONCURRENCY) for provider in HANDLERS}
 
-    if not os.getenv("ANTHROPIC_API_KEY"):
-        warning("ANTHROPIC_API_KEY environment variable not set.", "[Config]")
-        
-    if not os.getenv("DEEPSEEK_API_KEY"):
-        warning("DEEPSEEK_API_KEY environment variable not set.", "[Config]")
+    # Persist chat messages off the request path
+    app.state.write_queue = asyncio.Queue(maxsize=MESSAGE_QUEUE_SIZE)
+    app.state.writer = asyncio.create_task(message_writer(app.state.write_queue))
+    info("Background message writer started", "[Lifespan]")
         
     yield
     
     # Cleanup on shutdown
+    info("Flushing pending message writes...", "[Lifespan]")
+    try:
+        # Bounded, since each failed write can wait out a pool checkout timeout
+        await asyncio.wait_for(app.state.write_queue.join(), timeout=_MESSAGE_FLUSH_TIMEOUT)
+    except asyncio.TimeoutError:
+        warning(f"Message writes not flushed within {_MESSAGE_FLUSH_TIMEOUT}s; "
+                f"{app.state.write_queue.qsize()} messages still queued are dropped", "[Lifespan]")
+    app.state.writer.cancel()
+    # Let the writer unwind before the engine it uses is disposed
+    with contextlib.suppress(asyncio.CancelledError):
+        await app.state.writer
+    await wait_for_pending_requests()
+    await close_http_clients()
     info("Closing database connections...", "[Lifespan]")
     if db_manager.engine:
         await db_manager.engine.dispose()
@@ -135,11 +166,111 @@ app = FastAPI(
     title="Unified AI API",
     description="An API to interact with multiple AI providers.",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Verify bearer tokens once per request; endpoints read the result via get_current_client_id
+app.add_middleware(AuthMiddleware)
+
+
+# Health check body and headers are built once; probes hit this endpoint constantly
+_HEALTH_BODY = b'{"status":"ok"}'
+_HEALTH_HEADERS = {"Cache-Control": "no-store"}
+
+
+@app.get("/", include_in_schema=False)
+async def health_check():
+    """
+    Health check for load balancers and liveness/readiness probes.
+    
+    The pre-encoded body is sent as-is, skipping response model handling and
+    JSON encoding. A new Response is created per call because middleware may
+    modify the headers of the response it sends.
+    
+    Returns:
+        Response: {"status": "ok"} with status 200
+    """
+    return Response(content=_HEALTH_BODY, media_type="application/json", headers=_HEALTH_HEADERS)
+
+
+def http_error_boundary(tag: str, detail: str = "An internal error occurred", value_error_status: int = 400):
+    """
+    Decorator that maps endpoint exceptions to HTTP errors in one place.
+    
+    - HTTPException: re-raised unchanged
+    - ValueError: logged as a warning and returned with `value_error_status`
+      and the error message as detail
+    - Any other exception: logged with its traceback and returned as a 500
+      with a generic `detail`, so internals are not leaked to clients
+    
+    The wrapper keeps the endpoint's signature (via functools.wraps), so
+    FastAPI still resolves its parameters and dependencies.
+    
+    Args:
+        tag (str): Log prefix for the endpoint (e.g., "[Chat]")
+        detail (str): Response detail for unexpected errors
+        value_error_status (int): Status code used for ValueError
+        
+    Returns:
+        Callable: The decorator
+    """
+    def decorator(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            except HTTPException:
+                raise
+            except ValueError as e:
+                warning(f"Rejected request in {endpoint.__name__}: {e}", tag)
+                raise HTTPException(status_code=value_error_status, detail=str(e))
+            except Exception:
+                error(f"Internal error in {endpoint.__name__}", tag, exc_info=True)
+                raise HTTPException(status_code=500, detail=detail)
+        return wrapper
+    return decorator
+
+
+# Keep proxies (e.g. nginx) and browsers from buffering or caching event streams,
+# so each frame reaches the client as soon as it is written
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
 
-async def _dispatch_and_respond(request: GenerateRequest, client_id: str):
+# Concurrent provider calls allowed per provider in this process. Requests over the
+# limit get an immediate 429 instead of queueing on the provider and the DB pool.
+# The semaphores themselves are created in lifespan() as app.state.provider_slots.
+_PROVIDER_MAX_CONCURRENCY = int(os.getenv("PROVIDER_MAX_CONCURRENCY", "32"))
+_RETRY_AFTER_HEADERS = {"Retry-After": "1"}
+
+
+async def _acquire_provider_slot(provider: Provider) -> asyncio.Semaphore:
+    """
+    Takes one of the provider's PROVIDER_MAX_CONCURRENCY (default: 32) slots without waiting.
+    
+    Called before any other work for a request, so a rejected request has no
+    side effects and can simply be retried.
+    
+    Args:
+        provider (Provider): The provider the request will be dispatched to
+        
+    Returns:
+        asyncio.Semaphore: The provider's semaphore; the caller owns one slot on it
+        
+    Raises:
+        HTTPException: 429 if all slots for the provider are in use
+    """
+    slots = app.state.provider_slots[provider]
+    if slots.locked():
+        warning(f"Concurrency limit reached for provider {provider.value}", "[Server]")
+        raise HTTPException(status_code=429,
+                            detail=f"Too many concurrent requests for provider '{provider.value}'. Please retry shortly.",
+                            headers=_RETRY_AFTER_HEADERS)
+    # A slot is free, so this returns without waiting
+    await slots.acquire()
+    return slots
+
+
+async def _dispatch_and_respond(request: GenerateRequest, client_id: str, slots: asyncio.Semaphore):
     """
     Helper function for generate and chat endpoints to dispatch requests and format HTTP responses.
     
@@ -147,36 +278,49 @@ async def _dispatch_and_respond(request: GenerateRequest, client_id: str):
     endpoints by providing a common interface for request dispatching and response
     formatting. It handles both streaming and non-streaming responses appropriately.
     
+    The caller takes a provider slot with _acquire_provider_slot first and hands it
+    over here; it is released once the call is done, or, for a streamed response,
+    when the stream is closed.
+    
     Args:
         request (GenerateRequest): The generation request containing provider, model,
                                  messages, and other parameters
         client_id (str): The authenticated client identifier
+        slots (asyncio.Semaphore): The provider's semaphore, with one slot held for this call
         
     Returns:
         StreamingResponse: For streaming requests, returns a streaming HTTP response
-        dict: For non-streaming requests, returns a JSON response with "response" key
+        Response object: For non-streaming requests, the handler's Response
         
     Raises:
         HTTPException: 
             - 500 if streaming is requested but not supported by provider
             - Any errors from the underlying dispatch_request function
     """
-    debug(f"Dispatching request for client: {client_id}", "[Server]")
+    debug(lambda: f"Dispatching request for client: {client_id}", "[Server]")
     
-    response = await dispatch_request(request, client_id)
+    try:
+        result = await dispatch_request(request, client_id)
+    except BaseException:
+        slots.release()
+        raise
+
+    if result.stream:
+        debug("Streaming response initiated", "[Server]")
+        # Frames are sent as soon as the provider yields them; the slot is freed when the stream closes
+        return StreamingResponse(release_on_close(result.body, slots.release),
+                                 media_type="text/event-stream; charset=utf-8", headers=_SSE_HEADERS)
+
+    slots.release()
     if request.stream:
-        if isinstance(response, AsyncIterable):
-            debug("Streaming response initiated", "[Server]")
-            return StreamingResponse(response, media_type="text/event-stream")
-        else:
-            error("Streaming was requested but is not supported or failed for this provider.", "[Server]")
-            raise HTTPException(status_code=500, detail="Streaming was requested but is not supported or failed for this provider.")
-    else:
-        debug("Returning non-streamed response", "[Server]")
-        return {"response": response}
+        error("Streaming was requested but is not supported or failed for this provider.", "[Server]")
+        raise HTTPException(status_code=500, detail="Streaming was requested but is not supported or failed for this provider.")
+    debug("Returning non-streamed response", "[Server]")
+    return result.body
 
 
-@app.get("/api/generate")
+@app.post("/api/generate")
+@http_error_boundary("[Generate]")
 async def generate(request: GenerateRequest, client_id: str = Depends(get_current_client_id)):
     """
     Handle one-shot text generation requests.
@@ -204,6 +348,7 @@ async def generate(request: GenerateRequest, client_id: str = Depends(get_curren
         HTTPException:
             - 400: Validation error in request parameters
             - 401: Authentication required (from middleware)
+            - 429: Too many concurrent requests for the provider
             - 500: Internal server error during generation
             
     Example:
@@ -219,19 +364,18 @@ async def generate(request: GenerateRequest, client_id: str = Depends(get_curren
         ```
     """
     info(f"Received one-shot generation request for provider: {request.provider}", "[Generate]")
-    debug(f"Model: {request.model}, Client ID: {client_id}", "[Generate]")
+    debug(lambda: f"Model: {request.model}, Client ID: {client_id}", "[Generate]")
     
-    try:
-        return await _dispatch_and_respond(request, client_id)
-    except ValueError as e:
-        error(f"Validation error in generate endpoint: {e}", "[Generate]")
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        error(f"Internal error in generate endpoint at line {e.__traceback__.tb_lineno}: {e}", "[Generate]")
-        raise HTTPException(status_code=500, detail=f"An internal error occurred: {str(e)}")
+    slots = await _acquire_provider_slot(request.provider)
+    response = await _dispatch_and_respond(request, client_id, slots)
+    if request.stream:
+        return response
+    # Returning the response class directly skips FastAPI's jsonable_encoder pass
+    return ORJSONResponse({"response": response})
 
 
-@app.get("/api/chat")
+@app.post("/api/chat")
+@http_error_boundary("[Chat]")
 async def chat(request: ChatRequest, client_id: str = Depends(get_current_client_id)):
     """
     Handle conversational chat requests with persistent history.
@@ -258,13 +402,14 @@ async def chat(request: ChatRequest, client_id: str = Depends(get_current_client
         
     Side Effects:
         - Creates new chat session if chat_id is None
-        - Adds user message to chat history
-        - Adds AI response to chat history after generation
+        - Adds user message to chat history concurrently with the provider call
+        - Queues AI response for persistence after generation
         
     Raises:
         HTTPException:
-            - 400: Validation error in request parameters
+            - 400: Validation error in request parameters, or chat_id names an unknown chat
             - 401: Authentication required
+            - 429: Too many concurrent requests for the provider
             - 500: Internal server error during chat processing
             
     Example:
@@ -282,66 +427,144 @@ async def chat(request: ChatRequest, client_id: str = Depends(get_current_client
     
     
     info(f"Received chat request for provider: {request.provider}", "[Chat]")
-    debug(f"Model: {request.model}, Client ID: {client_id}, Chat ID: {request.chat_id}", "[Chat]")
+    debug(lambda: f"Model: {request.model}, Client ID: {client_id}, Chat ID: {request.chat_id}", "[Chat]")
     
+    new_chat = request.chat_id is None
+    if new_chat:
+        info("No chat ID provided, creating a new chat session.", "[Chat]")
+    else:
+        info(f"Using existing chat session with ID: {request.chat_id}", "[Chat]")
+    # Taken before anything is read or stored, so a 429 leaves the chat untouched
+    slots = await _acquire_provider_slot(request.provider)
     try:
-        messages = []
-        if request.chat_id is None:
-            info("No chat ID provided, creating a new chat session.", "[Chat]")
-            request.chat_id = await create_chat(client_id)
-            info(f"New chat session created with ID: {request.chat_id}", "[Chat]")
-            await add_message(request.chat_id, request.message)
-        else:
-            info(f"Using existing chat session with ID: {request.chat_id}", "[Chat]")
-            messages = await chat_history(request.chat_id)
-            await add_message(request.chat_id, request.message)
-        messages.append(request.message)
-
-
+        # Keep the resolved chat ID in a local instead of writing it back onto the validated request
+        chat_id, messages, index = await prepare_chat_turn(request.chat_id, request.message)
+    except BaseException:
+        slots.release()
+        raise
 
+    # Store the user message while the provider is being called; the write
+    # is awaited before the response is returned, and the assistant reply goes
+    # to the background writer under the index reserved right after it
+    write_task = asyncio.create_task(store_chat_turn(chat_id, client_id, request.message, index, new_chat))
+    response = None
+    try:
+        # The fields were validated as part of ChatRequest, so skip revalidating them
         response = await _dispatch_and_respond(
-            GenerateRequest(provider=request.provider, 
-                            model=request.model, 
-                            systemPrompt=request.systemPrompt,
-                            tools=request.tools,
-                            stream=request.stream,
-                            parameters=request.parameters,
-                            messages=messages), client_id)
-        debug(f"response: {response}", "[Chat]")
-        if request.stream:
-            # For streaming responses, we need to collect chunks and save after streaming
-            async def stream_and_save():
-                complete_response = []
-                async for chunk in response.body_iterator:
-                    complete_response.append(chunk.decode())
+            GenerateRequest.model_construct(provider=request.provider, 
+                                            model=request.model, 
+                                            systemPrompt=request.systemPrompt,
+                                            tools=request.tools,
+                                            stream=request.stream,
+                                            parameters=request.parameters,
+                                            messages=messages), client_id, slots)
+    finally:
+        try:
+            # The index actually used; it differs from the reserved one only after a collision
+            index = await write_task
+        except Exception as e:
+            error(f"Failed to store user message for chat {chat_id}: {e}", "[Chat]")
+            if isinstance(response, StreamingResponse):
+                # The stream will never be sent; close it now so its provider slot is freed
+                await response.body_iterator.aclose()
+            raise
+    debug(lambda: f"response: {response}", "[Chat]")
+    reply_index = index + 1
+    if request.stream:
+        # For streaming responses, record chunks as they pass through the existing
+        # response and queue the reply once the provider stream is exhausted.
+        # That happens before the final (empty) body message is sent, so the
+        # client cannot start its next turn before the reply is queued.
+        # Handlers yield bytes frames, so chunks are appended to one buffer as-is
+        # and decoded once at the end
+        complete_response = bytearray()
+        provider_stream = response.body_iterator
+        record = complete_response.extend
+
+        async def record_chunks():
+            try:
+                async for chunk in provider_stream:
+                    record(chunk)
                     yield chunk
-                # After streaming, save the complete response to database
-                full_response = ''.join(complete_response)
-                await add_message(request.chat_id, message(role='assistant', content=full_response))
-            
-            return StreamingResponse(stream_and_save(), media_type="text/event-stream")
-        else:
-            # For non-streaming responses, save directly and return
-            # Handle both string responses and dict responses from handlers
-            
-            # Extract the actual response from the wrapper dictionary
-            actual_response = response["response"] if isinstance(response, dict) and "response" in response else response
-
-            if actual_response.type == "message":
-                await add_message(request.chat_id, message(role='assistant', content=actual_response.content))
-            elif actual_response.type == "function_call":
-                await add_message(request.chat_id, message(role='assistant', content=actual_response.function_name, function_args=actual_response.function_args))
-            elif actual_response.type == "error":
-                raise HTTPException(status_code=500, detail=actual_response.content)
-            actual_response.chat_id = request.chat_id
-            return actual_response
-    
-    except ValueError as e:
-        error(f"Validation error in chat endpoint: {e}", "[Chat]")
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        error(f"Internal error in chat endpoint at line {e.__traceback__.tb_lineno}: {e}", "[Chat]")
-        raise HTTPException(status_code=500, detail=f"An internal error occurred: {str(e)}")
+                await queue_message(app.state.write_queue, chat_id, reply_index,
+                              message(role='assistant', content=complete_response.decode()))
+            finally:
+                # Frees the provider slot at once if the client disconnected mid-stream
+                await provider_stream.aclose()
+
+        response.body_iterator = record_chunks()
+        return response
+    else:
+        # For non-streaming responses, save directly and return.
+        actual_response = response
+        if actual_response.type == "message":
+            await queue_message(app.state.write_queue, chat_id, reply_index,
+                          message(role='assistant', content=actual_response.content))
+        elif actual_response.type == "function_call":
+            await queue_message(app.state.write_queue, chat_id, reply_index,
+                          message(role='assistant', content=actual_response.function_name, function_args=actual_response.function_args))
+        elif actual_response.type == "error":
+            raise HTTPException(status_code=500, detail=actual_response.content)
+        actual_response.chat_id = chat_id
+        # Returning the response class directly skips FastAPI's jsonable_encoder pass
+        return ORJSONResponse(actual_response)
+
+
+# Per-provider model lists, stored as the serialized response body and refreshed after the TTL expires
+_MODELS_CACHE_TTL = int(os.getenv("MODELS_CACHE_TTL_SECONDS", "300"))
+_models_cache = TTLCache(ttl=_MODELS_CACHE_TTL)
+# Lets clients and proxies cache model lists for as long as the server does
+_MODELS_HEADERS = {"Cache-Control": f"public, max-age={_MODELS_CACHE_TTL}"}
+_models_locks = {provider: asyncio.Lock() for provider in Provider}
+# Supported providers by lowercase name, so path parameters resolve with one dict lookup
+_PROVIDER_BY_NAME = {provider.value.lower(): provider for provider in Provider if provider in HANDLERS}
+
+
+def _resolve_provider(name: str) -> Provider | None:
+    """
+    Resolve a provider path parameter to a supported Provider.
+    
+    The exact name is tried first so the common lowercase case does not
+    allocate a lowered copy of the string.
+    
+    Args:
+        name (str): The provider name from the request path
+        
+    Returns:
+        Provider | None: The matching provider, or None if it is not supported
+    """
+    return _PROVIDER_BY_NAME.get(name) or _PROVIDER_BY_NAME.get(name.lower())
+
+
+async def _cached_models(provider_enum: Provider) -> bytes | None:
+    """
+    Return the serialized models response for a provider, serving from the TTL cache when possible.
+    
+    On a miss, the handler's get_models() is run in the threadpool because some
+    providers list models with a blocking SDK call. A per-provider lock makes
+    concurrent misses wait for a single refresh instead of each calling the provider.
+    The list is serialized once when it is cached, so hits skip JSON encoding.
+    
+    Args:
+        provider_enum (Provider): The provider to fetch models for
+        
+    Returns:
+        bytes | None: The JSON body {"models": [...]}, or None if the handler returned no models
+    """
+    body = _models_cache.get(provider_enum)
+    if body is not None:
+        debug(lambda: f"Serving cached models for provider {provider_enum.value}", "[Models]")
+        return body
+
+    async with _models_locks[provider_enum]:
+        # Another request may have refreshed the entry while we waited
+        body = _models_cache.get(provider_enum)
+        if body is None:
+            models = await run_in_threadpool(HANDLERS[provider_enum].get_models)
+            if models is not None:
+                body = orjson.dumps({"models": models})
+                _models_cache.set(provider_enum, body)
+        return body
 
 
 @app.get("/api/models/{provider}")
@@ -350,8 +573,10 @@ async def get_models(provider: str):
     Retrieve available models for a specific AI provider.
     
     This endpoint returns a list of available models for the specified provider.
-    The models list is fetched directly from the provider's handler and represents
-    the currently available models that can be used for generation requests.
+    The models list is fetched from the provider's handler and cached in memory
+    for MODELS_CACHE_TTL_SECONDS (default: 300) as a pre-serialized JSON body,
+    to avoid repeating provider calls and re-encoding the list. The response
+    carries a matching Cache-Control header so HTTP caches can serve it as well.
     
     Args:
         provider (str): The AI provider name (openai, google, anthropic, deepseek)
@@ -379,21 +604,23 @@ async def get_models(provider: str):
         ```
     """
     info(f"Fetching available models for provider: {provider}", "[Models]")
-    provider_enum = Provider(provider.lower())
-    if provider_enum not in HANDLERS:
+    provider_enum = _resolve_provider(provider)
+    if provider_enum is None:
         warning(f"Attempted to get models for unsupported provider: {provider}", "[Models]")
-        raise HTTPException(status_code=400, detail=f"Provider '{provider}' not supported")
+        # Returned rather than raised: probes for unknown providers skip exception handling
+        return ORJSONResponse({"detail": f"Provider '{provider}' not supported"}, status_code=400)
     
-    models = HANDLERS[provider_enum].get_models()
-    if models is None:
+    body = await _cached_models(provider_enum)
+    if body is None:
         error(f"Provider '{provider}' failed to return models.", "[Models]")
         raise HTTPException(status_code=500, detail=f"Could not retrieve models for provider '{provider}'")
     
-    debug(f"Returning models for provider {provider}: {models}", "[Models]")
-    return {"models": models}
+    debug(lambda: f"Returning models for provider {provider}: {body.decode()}", "[Models]")
+    return Response(content=body, media_type="application/json", headers=_MODELS_HEADERS)
 
 
 @app.post("/api/signup")
+@http_error_boundary("[Auth]")
 async def signup(credentials: ClientCredentials):
     """
     Register a new client account.
@@ -441,12 +668,10 @@ async def signup(credentials: ClientCredentials):
         else:
             error(f"Database integrity error during signup for {credentials.email}: {e}", "[Auth]")
             raise HTTPException(status_code=400, detail="Database error")
-    except Exception as e:
-        error(f"Exception during signup for {credentials.email} at line {e.__traceback__.tb_lineno}: {e}", "[Auth]")
-        raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/token")
+@app.post("/api/token")
+@http_error_boundary("[Auth]")
 async def get_token(credentials: ClientCredentials):
     """
     Generate a JWT access token for client authentication.
@@ -478,7 +703,7 @@ async def get_token(credentials: ClientCredentials):
             - 500: Internal server error during token generation
             
     Usage:
-        1. Obtain token: GET /api/token with credentials
+        1. Obtain token: POST /api/token with credentials
         2. Use token: Include "Authorization: Bearer <token>" header in requests
         
     Example:
@@ -507,6 +732,7 @@ async def get_token(credentials: ClientCredentials):
 
 
 @app.post("/api/template", status_code=201)
+@http_error_boundary("[Template]", detail="Failed to create template.", value_error_status=409)
 async def handle_create_template(
     template_data: PromptTemplateCreate,
     client_id: str = Depends(get_current_client_id)
@@ -551,23 +777,18 @@ async def handle_create_template(
         ```
     """
     info(f"Creating new prompt template '{template_data.name}' for client: {client_id}", "[Template]")
-    try:
-        template = await create_prompt_template(template_data)
-        info(f"Template '{template.name}' created successfully", "[Template]")
-        return {
-            "name": template.name,
-            "tenant_fields": template.tenant_fields,
-            "created_at": template.created_at
-        }
-    except ValueError as e:
-        warning(f"Conflict creating template '{template_data.name}': {e}", "[Template]")
-        raise HTTPException(status_code=409, detail=str(e)) # 409 Conflict
-    except Exception as e:
-        error(f"Error creating template '{template_data.name}' at line {e.__traceback__.tb_lineno}: {e}", "[Template]")
-        raise HTTPException(status_code=500, detail="Failed to create template.")
+    # A ValueError here means the name is taken and is returned as 409 Conflict
+    template = await create_prompt_template(template_data)
+    info(f"Template '{template.name}' created successfully", "[Template]")
+    return {
+        "name": template.name,
+        "tenant_fields": template.tenant_fields,
+        "created_at": template.created_at
+    }
 
 
 @app.put("/api/template")
+@http_error_boundary("[Template]", detail="Failed to update template.", value_error_status=404)
 async def handle_update_template(
     template_data: PromptTemplateCreate,
     client_id: str = Depends(get_current_client_id)
@@ -613,22 +834,17 @@ async def handle_update_template(
         ```
     """
     info(f"Updating prompt template '{template_data.name}' for client: {client_id}", "[Template]")
-    try:
-        template = await update_prompt_template(template_data.name, template_data)
-        info(f"Template '{template_data.name}' updated successfully", "[Template]")
-        return {
-            "name": template.name,
-            "tenant_fields": template.tenant_fields
-        }
-    except ValueError as e:
-        warning(f"Template '{template_data.name}' not found for update: {e}", "[Template]")
-        raise HTTPException(status_code=404, detail=str(e)) # 404 Not Found
-    except Exception as e:
-        error(f"Error updating template '{template_data.name}' at line {e.__traceback__.tb_lineno}: {e}", "[Template]")
-        raise HTTPException(status_code=500, detail="Failed to update template.")
+    # A ValueError here means the template does not exist and is returned as 404 Not Found
+    template = await update_prompt_template(template_data.name, template_data)
+    info(f"Template '{template_data.name}' updated successfully", "[Template]")
+    return {
+        "name": template.name,
+        "tenant_fields": template.tenant_fields
+    }
 
 
 @app.post("/api/apikey", status_code=201)
+@http_error_boundary("[APIKey]", detail="Failed to store API key.")
 async def create_api_key(
     api_key_data: APIKeyCreate,
     client_id: str = Depends(get_current_client_id)
@@ -676,23 +892,15 @@ async def create_api_key(
         ```
     """
     info(f"Creating API key for provider: {api_key_data.provider} for client: {client_id}", "[APIKey]")
-    try:
-        await store_api_key(api_key_data.provider.value, client_id, api_key_data.api_key)
-        info(f"API key for provider '{api_key_data.provider}' stored successfully", "[APIKey]")
-        
-        # Return masked API key for security
-        masked_key = api_key_data.api_key[:8] + "*" * (len(api_key_data.api_key) - 12) + api_key_data.api_key[-4:]
-        return {
-            "provider": api_key_data.provider,
-            "masked_api_key": masked_key,
-            "message": "API key stored successfully"
-        }
-    except ValueError as e:
-        warning(f"Invalid data for API key creation: {e}", "[APIKey]")
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        error(f"Error storing API key for provider '{api_key_data.provider}' at line {e.__traceback__.tb_lineno}: {e}", "[APIKey]")
-        raise HTTPException(status_code=500, detail="Failed to store API key.")
+    # Mask first: keys too short to mask are rejected (400) before being stored
+    masked_key = mask_api_key(api_key_data.api_key)
+    await store_api_key(api_key_data.provider.value, client_id, api_key_data.api_key)
+    info(f"API key for provider '{api_key_data.provider}' stored successfully", "[APIKey]")
+    return {
+        "provider": api_key_data.provider,
+        "masked_api_key": masked_key,
+        "message": "API key stored successfully"
+    }
 
 
 # @app.get("/api/apikey/{provider}")
@@ -727,7 +935,7 @@ async def create_api_key(
 #             raise HTTPException(status_code=404, detail=f"No API key found for provider '{provider}'")
         
 #         # Return masked API key for security
-#         masked_key = api_key[:8] + "*" * (len(api_key) - 12) + api_key[-4:]
+#         masked_key = mask_api_key(api_key)
 #         debug(f"API key retrieved for provider {provider}", "[APIKey]")
 #         return APIKeyResponse(
 #             provider=provider,
@@ -741,6 +949,7 @@ async def create_api_key(
 
 
 @app.put("/api/apikey/{provider}")
+@http_error_boundary("[APIKey]", detail="Failed to update API key.")
 async def update_api_key_endpoint(
     provider: str,
     api_key_data: APIKeyUpdate,
@@ -785,26 +994,19 @@ async def update_api_key_endpoint(
         ```
     """
     info(f"Updating API key for provider: {provider} for client: {client_id}", "[APIKey]")
-    try:
-        await update_api_key(provider, client_id, api_key_data.api_key)
-        info(f"API key for provider '{provider}' updated successfully", "[APIKey]")
-        
-        # Return masked API key for security
-        masked_key = api_key_data.api_key[:8] + "*" * (len(api_key_data.api_key) - 12) + api_key_data.api_key[-4:]
-        return {
-            "provider": provider,
-            "masked_api_key": masked_key,
-            "message": "API key updated successfully"
-        }
-    except ValueError as e:
-        warning(f"Invalid data for API key update: {e}", "[APIKey]")
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        error(f"Error updating API key for provider '{provider}' at line {e.__traceback__.tb_lineno}: {e}", "[APIKey]")
-        raise HTTPException(status_code=500, detail="Failed to update API key.")
+    # Mask first: keys too short to mask are rejected (400) before being stored
+    masked_key = mask_api_key(api_key_data.api_key)
+    await update_api_key(provider, client_id, api_key_data.api_key)
+    info(f"API key for provider '{provider}' updated successfully", "[APIKey]")
+    return {
+        "provider": provider,
+        "masked_api_key": masked_key,
+        "message": "API key updated successfully"
+    }
 
 
 @app.delete("/api/apikey/{provider}")
+@http_error_boundary("[APIKey]", detail="Failed to delete API key.")
 async def delete_api_key_endpoint(
     provider: str,
     client_id: str = Depends(get_current_client_id)
@@ -842,14 +1044,27 @@ async def delete_api_key_endpoint(
         DELETE /api/apikey/openai
     """
     info(f"Deleting API key for provider: {provider} for client: {client_id}", "[APIKey]")
-    try:
-        await delete_api_key(provider, client_id)
-        info(f"API key for provider '{provider}' deleted successfully", "[APIKey]")
-        return {
-            "provider": provider,
-            "message": "API key deleted successfully"
-        }
-    except Exception as e:
-        error(f"Error deleting API key for provider '{provider}' at line {e.__traceback__.tb_lineno}: {e}", "[APIKey]")
-        raise HTTPException(status_code=500, detail="Failed to delete API key.")
+    await delete_api_key(provider, client_id)
+    info(f"API key for provider '{provider}' deleted successfully", "[APIKey]")
+    return {
+        "provider": provider,
+        "message": "API key deleted successfully"
+    }
+
 
+if __name__ == "__main__":
+    # Entry point for `python -m app.server`. uvloop replaces the default asyncio
+    # event loop with a libuv-based one; it is not available on Windows.
+    # A single worker process runs unless WORKERS is set; each worker has its
+    # own database pool and in-memory caches.
+    import sys
+    import uvicorn
+    uvicorn.run(
+        "app.server:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=int(os.getenv("WORKERS", "1")),
+        backlog=int(os.getenv("BACKLOG", "2048")),
+    )
@@ -0,0 +1,42 @@
+"""
+API Key Utilities
+
+This module provides helpers for presenting client API keys safely in API
+responses.
+
+Key Functions:
+- mask_api_key: Masks the middle of an API key, keeping the first 8 and the
+  last 4 characters visible. Keys too short to mask are rejected.
+
+Author: Ramazan Seçilmiş
+Version: 1.0.0
+"""
+
+# Pre-built mask; sliced to length instead of rebuilding "*" * n per call
+_MASK = "*" * 64
+
+
+# Keys must hide at least one character behind the 8 + 4 visible ones
+MIN_API_KEY_LENGTH = 13
+
+
+def mask_api_key(api_key: str) -> str:
+    """
+    Masks an API key for display, e.g. "sk-12345****...****abcd".
+
+    Args:
+        api_key (str): The plaintext API key.
+
+    Returns:
+        str: The key with everything but the first 8 and last 4 characters
+             replaced by '*'.
+
+    Raises:
+        ValueError: If the key is shorter than MIN_API_KEY_LENGTH, since
+                    masking it would reveal the whole key.
+    """
+    if len(api_key) < MIN_API_KEY_LENGTH:
+        raise ValueError(f"API key is too short; it must be at least {MIN_API_KEY_LENGTH} characters.")
+    hidden = len(api_key) - 12
+    stars = _MASK[:hidden] if hidden <= len(_MASK) else "*" * hidden
+    return f"{api_key[:8]}{stars}{api_key[-4:]}"
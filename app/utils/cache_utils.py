@@ -0,0 +1,70 @@
+"""
+In-Memory Cache Utilities
+
+This module provides a small process-local cache with per-entry expiry. It is
+used to keep the results of expensive or remote lookups in memory for a short
+time so repeated requests can be served without redoing the work.
+
+Key Components:
+- TTLCache: A dictionary-backed cache whose entries expire after a fixed
+  time-to-live, with an optional maximum size.
+
+Author: Ramazan Seçilmiş
+Version: 1.0.0
+"""
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    A simple time-based cache.
+
+    Entries expire `ttl` seconds after they are set. When `maxsize` is reached,
+    the oldest entry is evicted to make room for a new one. The cache is not
+    thread-safe; it is meant to be used from the event loop.
+    """
+    def __init__(self, ttl: float, maxsize: Optional[int] = None):
+        """
+        Initializes the cache.
+
+        Args:
+            ttl (float): Time-to-live of each entry in seconds.
+            maxsize (Optional[int]): Maximum number of entries, unbounded if None.
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value for a key, or `default` if missing or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores a value, optionally overriding the default time-to-live.
+        """
+        if key not in self._data and self.maxsize is not None and len(self._data) >= self.maxsize:
+            # Dicts keep insertion order, so the first key is the oldest entry
+            del self._data[next(iter(self._data))]
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Removes a single entry if present."""
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,79 @@
+"""
+Application Configuration
+
+This module reads environment variables used on the request path once at
+import time and exposes them through immutable configuration objects. Other
+modules import CONFIG and SETTINGS instead of calling os.getenv on every request.
+
+Key Components:
+- PROVIDER_ENVS: Maps each provider name to the environment variable holding its key.
+- ProviderConfig: A frozen dataclass holding the system-wide provider API keys.
+- CONFIG: The shared ProviderConfig instance built from the environment.
+- Settings: A frozen dataclass holding provider request timeouts.
+- SETTINGS: The shared Settings instance built from the environment.
+
+Author: Ramazan Seçilmiş
+Version: 1.0.0
+"""
+import os
+from dataclasses import dataclass
+from typing import Optional
+from dotenv import load_dotenv
+
+# The single place .env is loaded; console_logger imports this module first,
+# so every other module sees the variables when it reads them at import time
+load_dotenv()
+
+# Provider name -> environment variable holding its system-wide API key
+PROVIDER_ENVS = {
+    "google": "GOOGLE_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "anthropic": "ANTHROPIC_API_KEY",
+    "deepseek": "DEEPSEEK_API_KEY",
+}
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """
+    System-wide API keys for each supported AI provider.
+
+    A value of None means the key is not set in the environment.
+    """
+    google_api_key: Optional[str]
+    openai_api_key: Optional[str]
+    anthropic_api_key: Optional[str]
+    deepseek_api_key: Optional[str]
+
+    def __post_init__(self):
+        # Provider name -> key for the keys that are set, so api_key() is one dict lookup
+        keys = {name[:-len("_api_key")]: value for name, value in vars(self).items() if value}
+        object.__setattr__(self, "_keys", keys)
+
+    def api_key(self, provider: str) -> Optional[str]:
+        """
+        Returns the system API key for a provider, or None if it is not set.
+
+        Args:
+            provider (str): The provider name (e.g., 'openai', 'google').
+        """
+        return self._keys.get(provider) or self._keys.get(provider.lower())
+
+
+# Field names follow the provider names, so the config is built from the same table
+CONFIG = ProviderConfig(**{f"{provider}_api_key": os.environ.get(name) for provider, name in PROVIDER_ENVS.items()})
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Request settings used by the provider handlers.
+    """
+    api_timeout_seconds: int
+    api_stream_timeout_seconds: int
+
+
+SETTINGS = Settings(
+    api_timeout_seconds=int(os.getenv("API_TIMEOUT_SECONDS", "30")),
+    api_stream_timeout_seconds=int(os.getenv("API_STREAM_TIMEOUT_SECONDS", "60")),
+)
@@ -10,6 +10,21 @@ Key Features:
 - Color-coded output for improved readability
 - Enable/disable log levels and colors via environment variables or functions
 - Optional prefixes for categorizing log messages (e.g., component name)
+- Optional tracebacks on error() via exc_info=True, formatted only when
+  error logging is enabled
+- Lazy messages: pass a callable instead of a string and it is only called
+  when the level is enabled, so disabled levels skip all formatting work
+- Non-blocking output: messages are queued as (level, message, prefix) and
+  encoded and written to stdout by a background thread, so callers only pay
+  for a queue push and a slow or piped stdout never stalls the event loop.
+  Queued messages are written out when the process exits.
+- Batched output: the writer thread takes up to 64 queued messages at a time
+  and hands them to the kernel with a single os.writev call, so a burst of
+  log lines costs one write syscall instead of one per line. Where writev is
+  unavailable, a block-buffered stream is flushed once per batch instead.
+- Bytes output: level headers are encoded once, and each line is assembled as
+  bytes and written to the file descriptor directly, skipping the text
+  stream's per-call encoding layer.
 
 Environment Variables:
 - LOG_INFO: 'true' or 'false' (default: 'true')
@@ -17,15 +32,23 @@ Environment Variables:
 - LOG_ERROR: 'true' or 'false' (default: 'true')
 - LOG_DEBUG: 'true' or 'false' (default: 'false')
 - LOG_COLOR: 'true' or 'false' (default: 'true')
+- LOG_BUFFER_BYTES: Size of the fallback stdout buffer used where os.writev
+  is unavailable (default: 65536)
 
 Author: Ramazan Seçilmiş
 Version: 1.0.0
 """
-from dotenv import load_dotenv
+from typing import BinaryIO, Callable, List, Optional, Tuple, Union
+import atexit
+import io
 import os
+import queue
+import sys
+import threading
+import traceback
 
-# Load environment variables
-load_dotenv()
+# Loads the .env file (once, for the whole application) before LOG_* are read
+import app.utils.config  # noqa: F401
 
 # ANSI color codes
 COLORS = {
@@ -46,106 +69,251 @@ LOG_CONFIG = {
     'color_enabled': os.getenv('LOG_COLOR', 'true').lower() == 'true'
 }
 
-def _format_message(level: str, message: str, prefix: str = "") -> str:
+# LOG_CONFIG mirrored as plain module globals, so each log call checks one
+# global instead of subscripting the dict; kept in sync by _sync_flags()
+_INFO_ON = LOG_CONFIG['info_enabled']
+_WARNING_ON = LOG_CONFIG['warning_enabled']
+_ERROR_ON = LOG_CONFIG['error_enabled']
+_DEBUG_ON = LOG_CONFIG['debug_enabled']
+_COLOR_ON = LOG_CONFIG['color_enabled']
+
+# (level, message, prefix) entries waiting to be written; None stops the writer thread
+_LOG_QUEUE: "queue.SimpleQueue[Optional[Tuple[str, str, str]]]" = queue.SimpleQueue()
+
+def _open_output() -> Optional[BinaryIO]:
+    """
+    Opens a block-buffered binary stream on stdout's file descriptor.
+    
+    sys.stdout is line-buffered on a terminal, which flushes on every newline;
+    this stream is only flushed by the writer thread. Falls back to
+    sys.stdout's binary buffer when it has no file descriptor, and to None
+    when it has neither (e.g. when output is captured into a StringIO).
+    """
+    try:
+        return open(sys.stdout.fileno(), "wb", buffering=int(os.getenv("LOG_BUFFER_BYTES", "65536")),
+                    closefd=False)
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        return getattr(sys.stdout, "buffer", None)
+
+def _stdout_fd() -> Optional[int]:
+    """
+    Returns stdout's file descriptor for vectored writes, or None if it cannot be used.
+    """
+    if not hasattr(os, "writev"):
+        return None
+    try:
+        return sys.stdout.fileno()
+    except (AttributeError, ValueError, io.UnsupportedOperation):
+        return None
+
+_FD = _stdout_fd()
+_ENCODING = getattr(sys.stdout, "encoding", None) or "utf-8"
+# Stream used only where os.writev cannot be used
+_OUT = _open_output() if _FD is None else None
+# Messages written per syscall; well below the usual IOV_MAX of 1024
+_BATCH_SIZE = 64
+
+def _write_lines(chunks: List[bytes]) -> None:
+    """
+    Writes a batch of encoded, newline-terminated lines to stdout with one syscall.
     """
-    Formats a log message with a colored level header and optional prefix.
+    if _FD is None:
+        if _OUT is None:
+            sys.stdout.write(b"".join(chunks).decode(_ENCODING, "replace"))
+            sys.stdout.flush()
+        else:
+            _OUT.write(b"".join(chunks))
+            _OUT.flush()
+        return
+    try:
+        written = os.writev(_FD, chunks)
+        if written < sum(map(len, chunks)):
+            # Partial write (e.g. interrupted by a signal); finish with plain writes
+            rest = b"".join(chunks)[written:]
+            while rest:
+                rest = rest[os.write(_FD, rest):]
+    except OSError:
+        # stdout is gone (e.g. closed pipe); drop the batch rather than stop the writer
+        pass
+
+def _writer_loop() -> None:
     """
-    color_map = {
-        'INFO': COLORS['GREEN'],
-        'WARNING': COLORS['YELLOW'],
-        'ERROR': COLORS['RED'],
-        'DEBUG': COLORS['BLUE']
-    }
+    Encodes and writes queued messages to stdout until the stop sentinel is received.
     
-    if LOG_CONFIG['color_enabled']:
-        color = color_map.get(level, '')
-        reset = COLORS['RESET']
-        bold = COLORS['BOLD']
-        header = f"{color}{bold}[{level}]{reset}"
-    else:
-        header = f"[{level}]"
+    Each wake-up takes up to _BATCH_SIZE queued messages and writes them together.
+    An entry or batch that cannot be encoded or written is dropped, so the
+    thread keeps draining the queue.
+    """
+    running = True
+    while running:
+        batch = [_LOG_QUEUE.get()]
+        while len(batch) < _BATCH_SIZE:
+            try:
+                batch.append(_LOG_QUEUE.get_nowait())
+            except queue.Empty:
+                break
+        lines = []
+        for entry in batch:
+            if entry is None:
+                running = False
+                break
+            try:
+                lines.append(_encode_message(*entry))
+            except Exception:
+                # e.g. a non-str message; fall back to str() and drop the entry if that fails too
+                level, message, prefix = entry
+                try:
+                    lines.append(_encode_message(level, str(message), str(prefix)))
+                except Exception:
+                    pass
+        if lines:
+            try:
+                _write_lines(lines)
+            except Exception:
+                # Drop the batch; the thread must only stop on the sentinel
+                pass
+
+_writer = threading.Thread(target=_writer_loop, name="console-logger", daemon=True)
+_writer.start()
+
+@atexit.register
+def _stop_writer() -> None:
+    """
+    Writes out any queued messages and stops the writer thread on exit.
+    """
+    _LOG_QUEUE.put(None)
+    _writer.join()
+
+# Level headers are built once; formatting a message only picks one
+_LEVEL_COLORS = (('INFO', 'GREEN'), ('WARNING', 'YELLOW'), ('ERROR', 'RED'), ('DEBUG', 'BLUE'))
+_HEADERS_COLOR = {level: f"{COLORS[color]}{COLORS['BOLD']}[{level}]{COLORS['RESET']}" for level, color in _LEVEL_COLORS}
+_HEADERS_PLAIN = {level: f"[{level}]" for level, _ in _LEVEL_COLORS}
+# Headers are ASCII, so their encoded form is the same in any stdout encoding
+_HEADERS_COLOR_BYTES = {level: header.encode() + b" " for level, header in _HEADERS_COLOR.items()}
+_HEADERS_PLAIN_BYTES = {level: header.encode() + b" " for level, header in _HEADERS_PLAIN.items()}
+
+def _encode_message(level: str, message: str, prefix: str = "") -> bytes:
+    """
+    Builds the encoded, newline-terminated output line for a log message.
     
-    if prefix:
-        return f"{header} {prefix} {message}"
-    else:
-        return f"{header} {message}"
+    Only the prefix and message are encoded; the header bytes are reused.
+    """
+    header = (_HEADERS_COLOR_BYTES if _COLOR_ON else _HEADERS_PLAIN_BYTES)[level]
+    if not prefix:
+        # Uncommon: nearly every call site passes a component prefix
+        return b"".join((header, message.encode(_ENCODING, "replace"), b"\n"))
+    return b"".join((header, prefix.encode(_ENCODING, "replace"), b" ",
+                     message.encode(_ENCODING, "replace"), b"\n"))
 
-def info(message: str, prefix: str = "") -> None:
+def info(message: Union[str, Callable[[], str]], prefix: str = "") -> None:
     """
     Logs an informational message (green).
     
     Used for general workflow and status updates.
     
     Args:
-        message (str): The message to log.
+        message (Union[str, Callable[[], str]]): The message to log, or a
+            callable returning it that is only invoked when info logging is enabled.
         prefix (str, optional): A prefix for categorizing the message.
     """
-    if LOG_CONFIG['info_enabled']:
-        formatted_message = _format_message("INFO", message, prefix)
-        print(formatted_message)
+    if not _INFO_ON:
+        return
+    if callable(message):
+        message = message()
+    _LOG_QUEUE.put(("INFO", message, prefix))
 
-def warning(message: str, prefix: str = "") -> None:
+def warning(message: Union[str, Callable[[], str]], prefix: str = "") -> None:
     """
     Logs a warning message (yellow).
     
     Used for potential issues that don't stop the application.
     
     Args:
-        message (str): The message to log.
+        message (Union[str, Callable[[], str]]): The message to log, or a
+            callable returning it that is only invoked when warning logging is enabled.
         prefix (str, optional): A prefix for categorizing the message.
     """
-    if LOG_CONFIG['warning_enabled']:
-        formatted_message = _format_message("WARNING", message, prefix)
-        print(formatted_message)
+    if not _WARNING_ON:
+        return
+    if callable(message):
+        message = message()
+    _LOG_QUEUE.put(("WARNING", message, prefix))
 
-def error(message: str, prefix: str = "") -> None:
+def error(message: Union[str, Callable[[], str]], prefix: str = "", exc_info: bool = False) -> None:
     """
     Logs an error message (red).
     
     Used for critical errors that may affect functionality.
     
     Args:
-        message (str): The message to log.
+        message (Union[str, Callable[[], str]]): The message to log, or a
+            callable returning it that is only invoked when error logging is enabled.
         prefix (str, optional): A prefix for categorizing the message.
+        exc_info (bool, optional): If True, the traceback of the exception
+            being handled is appended. It is only formatted when error
+            logging is enabled.
     """
-    if LOG_CONFIG['error_enabled']:
-        formatted_message = _format_message("ERROR", message, prefix)
-        print(formatted_message)
+    if not _ERROR_ON:
+        return
+    if callable(message):
+        message = message()
+    if exc_info:
+        # The traceback must be captured here, while the exception is being handled
+        message = f"{message}\n{traceback.format_exc().rstrip()}"
+    _LOG_QUEUE.put(("ERROR", message, prefix))
 
-def debug(message: str, prefix: str = "") -> None:
+def debug(message: Union[str, Callable[[], str]], prefix: str = "") -> None:
     """
     Logs a debug message (blue).
     
     Used for detailed information and variable values for debugging.
     
     Args:
-        message (str): The message to log.
+        message (Union[str, Callable[[], str]]): The message to log, or a
+            callable returning it. A callable is only invoked when debug
+            logging is enabled, so per-request f-strings can be passed as
+            `lambda: f"..."` and cost nothing when debug is off.
         prefix (str, optional): A prefix for categorizing the message.
     """
-    if LOG_CONFIG['debug_enabled']:
-        formatted_message = _format_message("DEBUG", message, prefix)
-        print(formatted_message)
+    if not _DEBUG_ON:
+        return
+    if callable(message):
+        message = message()
+    _LOG_QUEUE.put(("DEBUG", message, prefix))
 
 # Configuration utilities
+def _sync_flags() -> None:
+    """Updates the module-level flags after LOG_CONFIG changes."""
+    global _INFO_ON, _WARNING_ON, _ERROR_ON, _DEBUG_ON, _COLOR_ON
+    _INFO_ON = LOG_CONFIG['info_enabled']
+    _WARNING_ON = LOG_CONFIG['warning_enabled']
+    _ERROR_ON = LOG_CONFIG['error_enabled']
+    _DEBUG_ON = LOG_CONFIG['debug_enabled']
+    _COLOR_ON = LOG_CONFIG['color_enabled']
+
 def enable_log_level(level: str) -> None:
     """Enables a specific log level (e.g., 'info', 'debug')."""
     key = f"{level.lower()}_enabled"
     if key in LOG_CONFIG:
         LOG_CONFIG[key] = True
+        _sync_flags()
 
 def disable_log_level(level: str) -> None:
     """Disables a specific log level."""
     key = f"{level.lower()}_enabled"
     if key in LOG_CONFIG:
         LOG_CONFIG[key] = False
+        _sync_flags()
 
 def enable_colors() -> None:
     """Enables colored log output."""
     LOG_CONFIG['color_enabled'] = True
+    _sync_flags()
 
 def disable_colors() -> None:
     """Disables colored log output."""
     LOG_CONFIG['color_enabled'] = False
+    _sync_flags()
 
 def get_config() -> dict:
     """Returns the current logging configuration."""
@@ -162,3 +330,4 @@ def set_config(**kwargs) -> None:
     for key, value in kwargs.items():
         if key in LOG_CONFIG:
             LOG_CONFIG[key] = bool(value)
+    _sync_flags()
@@ -0,0 +1,72 @@
+"""
+Shared HTTP Clients
+
+This module holds the HTTP clients used by the provider SDKs. Handlers are
+created per request, and without a shared client every SDK instance would open
+its own connection pool, paying a new TCP + TLS handshake on each request.
+Sharing one client per SDK keeps connections to the provider alive between
+requests.
+
+Each SDK's DefaultAsyncHttpxClient is used, so the clients match the HTTP
+library and defaults the SDK expects.
+
+When the optional `h2` package is installed, the clients negotiate HTTP/2, so
+concurrent requests to a provider are multiplexed over one TLS connection
+instead of each taking a pooled connection. Set PROVIDER_HTTP2=false to stay
+on HTTP/1.1.
+
+Key Functions:
+- openai_http_client: Shared client for OpenAI-compatible APIs (OpenAI, DeepSeek).
+- anthropic_http_client: Shared client for the Anthropic API.
+- close_http_clients: Closes the shared clients on application shutdown.
+
+Author: Ramazan Seçilmiş
+Version: 1.0.0
+"""
+import os
+from typing import Optional
+from openai import DefaultAsyncHttpxClient as OpenAIHttpClient
+from anthropic import DefaultAsyncHttpxClient as AnthropicHttpClient
+from app.utils.console_logger import info
+
+try:
+    import h2  # noqa: F401  (only needed for httpx's HTTP/2 support)
+    HTTP2_ENABLED = os.getenv("PROVIDER_HTTP2", "true").lower() == "true"
+except ImportError:
+    HTTP2_ENABLED = False
+
+_openai_client: Optional[OpenAIHttpClient] = None
+_anthropic_client: Optional[AnthropicHttpClient] = None
+
+
+def openai_http_client() -> OpenAIHttpClient:
+    """
+    Returns the shared HTTP client for OpenAI-compatible APIs, creating it on first use.
+    """
+    global _openai_client
+    if _openai_client is None or _openai_client.is_closed:
+        _openai_client = OpenAIHttpClient(http2=HTTP2_ENABLED)
+    return _openai_client
+
+
+def anthropic_http_client() -> AnthropicHttpClient:
+    """
+    Returns the shared HTTP client for the Anthropic API, creating it on first use.
+    """
+    global _anthropic_client
+    if _anthropic_client is None or _anthropic_client.is_closed:
+        _anthropic_client = AnthropicHttpClient(http2=HTTP2_ENABLED)
+    return _anthropic_client
+
+
+async def close_http_clients() -> None:
+    """
+    Closes the shared HTTP clients and their pooled connections.
+    """
+    global _openai_client, _anthropic_client
+    for client in (_openai_client, _anthropic_client):
+        if client is not None:
+            await client.aclose()
+    _openai_client = None
+    _anthropic_client = None
+    info("Shared HTTP clients closed", "[HTTPClient]")
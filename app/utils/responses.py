@@ -0,0 +1,36 @@
+"""
+Response Classes
+
+This module provides the JSON response class used as the application default.
+It serializes response bodies with orjson, a C-backed encoder that is much
+faster than the standard library json module used by JSONResponse.
+
+Pydantic models are dumped by pydantic-core and encoded by orjson, so
+endpoints can return an ORJSONResponse built from models directly and skip
+FastAPI's recursive jsonable_encoder pass.
+
+Key Components:
+- ORJSONResponse: A JSONResponse that renders its content with orjson.
+
+Author: Ramazan Seçilmiş
+Version: 1.0.0
+"""
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+
+def _default(obj: Any) -> Any:
+    """Serializes types orjson does not handle natively (pydantic models)."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
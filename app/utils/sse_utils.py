@@ -0,0 +1,49 @@
+"""
+Server-Sent Events Utilities
+
+This module builds the Server-Sent Events (SSE) frames yielded by the provider
+handlers in streaming mode. Frames are returned as bytes so they can be sent to
+the client without any further encoding, and JSON payloads are serialized with
+orjson.
+
+Key Functions/Components:
+- DONE_FRAME: The pre-encoded frame that marks the end of a stream.
+- sse_text: Frames a plain text chunk.
+- sse_json: Frames a JSON-serializable payload (e.g., tool calls).
+
+Author: Ramazan Seçilmiş
+Version: 1.0.0
+"""
+from typing import Any
+import orjson
+
+# Frame pieces are encoded once instead of formatted per chunk
+DATA_PREFIX = b"data: "
+FRAME_END = b"\n\n"
+DONE_FRAME = b"data: [DONE]\n\n"
+
+
+def sse_text(text: str) -> bytes:
+    """
+    Frames a text chunk as an SSE data event.
+
+    Args:
+        text (str): The text to send.
+
+    Returns:
+        bytes: The encoded frame, e.g. b"data: Hello\\n\\n".
+    """
+    return DATA_PREFIX + text.encode() + FRAME_END
+
+
+def sse_json(payload: Any) -> bytes:
+    """
+    Frames a JSON-serializable payload as an SSE data event.
+
+    Args:
+        payload (Any): The payload to serialize with orjson.
+
+    Returns:
+        bytes: The encoded frame containing the JSON document.
+    """
+    return DATA_PREFIX + orjson.dumps(payload) + FRAME_END
@@ -0,0 +1,69 @@
+"""
+Stream Utilities
+
+This module provides helpers for streamed response bodies before they are
+handed to Starlette's StreamingResponse.
+
+Key Functions:
+- release_on_close: Wraps a stream so a callback runs exactly once when the
+  stream finishes, fails, is closed (aclose()), or is discarded without being
+  started.
+
+Author: Ramazan Seçilmiş
+Version: 1.0.0
+"""
+import weakref
+from typing import AsyncIterable, AsyncIterator, Callable
+
+
+class _ReleasingStream:
+    """
+    Async iterator returned by release_on_close.
+
+    Unlike an async generator, closing it with aclose() runs the callback even
+    if iteration never started.
+    """
+    def __init__(self, stream: AsyncIterable[bytes], release: Callable[[], None]):
+        self._stream = stream.__aiter__()
+        # A finalize object runs its callback at most once, whichever path calls it first
+        self._release = weakref.finalize(self, release)
+
+    def __aiter__(self) -> "_ReleasingStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self._stream.__anext__()
+        except BaseException:
+            # End of stream, a failure or a cancellation
+            self._release()
+            raise
+
+    async def aclose(self) -> None:
+        """Closes the underlying stream, if it supports it, and runs the callback."""
+        try:
+            aclose = getattr(self._stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        finally:
+            self._release()
+
+
+def release_on_close(stream: AsyncIterable[bytes], release: Callable[[], None]) -> AsyncIterator[bytes]:
+    """
+    Wraps a stream so that `release` is called once the stream is done with.
+
+    The callback runs when iteration ends or raises, or when the wrapper is
+    closed with aclose(), whether or not it was iterated. A wrapper that is
+    discarded without either (e.g. the client disconnected before the body
+    was sent) runs it when garbage collected, so a held resource such as a
+    semaphore slot cannot leak.
+
+    Args:
+        stream (AsyncIterable[bytes]): The stream to pass through.
+        release (Callable[[], None]): Called exactly once.
+
+    Returns:
+        AsyncIterator[bytes]: The wrapped stream.
+    """
+    return _ReleasingStream(stream, release)
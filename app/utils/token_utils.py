@@ -23,6 +23,12 @@ from app.utils import console_logger
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-default-secret-key")
 ALGORITHM = "HS256"
 
+# Prepared once instead of on every call: one PyJWT instance, the key as bytes
+# (skips the str -> bytes conversion per token) and the allowed algorithms list
+_JWT = jwt.PyJWT()
+SECRET_KEY_BYTES = SECRET_KEY.encode("utf-8")
+_ALGORITHMS = [ALGORITHM]
+
 def create_token(client_id: str, expires_delta: timedelta = timedelta(minutes=15)) -> str:
     """
     Creates a new JWT for a given client ID.
@@ -34,15 +40,15 @@ def create_token(client_id: str, expires_delta: timedelta = timedelta(minutes=15
     Returns:
         str: The encoded JWT string.
     """
-    console_logger.info(f"Creating token for client_id: {client_id}", "[Token]")
-    console_logger.debug(f"Token expires in: {expires_delta}", "[Token]")
+    console_logger.info(lambda: f"Creating token for client_id: {client_id}", "[Token]")
+    console_logger.debug(lambda: f"Token expires in: {expires_delta}", "[Token]")
     
     expire = datetime.now(timezone.utc) + expires_delta
     to_encode = {"client_id": client_id, "exp": expire}
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = _JWT.encode(to_encode, SECRET_KEY_BYTES, algorithm=ALGORITHM)
     
     console_logger.info("Token created successfully", "[Token]")
-    console_logger.debug(f"Token expiration time: {expire}", "[Token]")
+    console_logger.debug(lambda: f"Token expiration time: {expire}", "[Token]")
     
     return encoded_jwt
 
@@ -61,12 +67,13 @@ def verify_token(token: str) -> dict:
             - 401: If the token has expired or is invalid.
     """
     console_logger.info("Verifying JWT token", "[Token]")
-    console_logger.debug(f"Token to verify: {token[:20]}...", "[Token]")
+    # Debug messages are lambdas so the slicing and payload repr only happen when debug is on
+    console_logger.debug(lambda: f"Token to verify: {token[:20]}...", "[Token]")
     
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = _JWT.decode(token, SECRET_KEY_BYTES, algorithms=_ALGORITHMS)
         console_logger.info("Token verified successfully", "[Token]")
-        console_logger.debug(f"Token payload: {payload}", "[Token]")
+        console_logger.debug(lambda: f"Token payload: {payload}", "[Token]")
         return payload
     except jwt.ExpiredSignatureError:
         console_logger.error("Token verification failed: Token has expired", "[Token]")
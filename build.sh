@@ -22,3 +22,19 @@ mkdir -p .pycache_central
 
 # Set Python to use a centralized location for bytecode files
 export PYTHONPYCACHEPREFIX=.pycache_central
+
+# Optionally compile the pure-Python helper modules to C extensions with mypyc.
+# The .py sources stay in place; Python prefers the compiled .so when present.
+# FastAPI modules (server, routers, auth) are left interpreted because FastAPI
+# inspects endpoint signatures at runtime. The logger and token helpers are
+# included since they run on every authenticated request.
+if [ "${BUILD_MYPYC:-false}" = "true" ]; then
+    echo "Compiling helper modules with mypyc..."
+    pip install mypy
+    mypyc --explicit-package-bases \
+        app/utils/api_key_utils.py \
+        app/utils/cache_utils.py \
+        app/utils/console_logger.py \
+        app/utils/sse_utils.py \
+        app/utils/token_utils.py
+fi
@@ -3,6 +3,14 @@
 # Set Python to use a centralized location for bytecode files
 export PYTHONPYCACHEPREFIX=.pycache_central
 
-# Run the application
+# Listen backlog for bursts of incoming connections
+BACKLOG=${BACKLOG:-2048}
+
+# Run the application. With WORKERS > 1, one process per worker is started
+# instead of the auto-reloading development server.
 echo "Starting server on http://0.0.0.0:8000"
-uvicorn app.server:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+if [ "${WORKERS:-1}" -gt 1 ]; then
+    uvicorn app.server:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools --workers "$WORKERS" --backlog "$BACKLOG"
+else
+    uvicorn app.server:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools --backlog "$BACKLOG" --reload
+fi
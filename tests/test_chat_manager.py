@@ -0,0 +1,132 @@
+"""
+Tests for the chat turn paths in app.DB_connection.chat_manager.
+
+The database is replaced by a scripted session: each execute() call returns
+(or raises) the next scripted result, so no PostgreSQL server is needed.
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.DB_connection import chat_manager
+from app.models.DataModels import ChatRequest, message
+
+
+class _Result:
+    """The parts of a SQLAlchemy result the chat manager reads."""
+    def __init__(self, rows=(), scalar=None):
+        self._rows = list(rows)
+        self._scalar = scalar
+
+    def all(self):
+        return self._rows
+
+    def scalar_one_or_none(self):
+        return self._scalar
+
+
+class _Session:
+    """A session whose execute() calls play back a script of results or exceptions."""
+    def __init__(self, script):
+        self.script = list(script)
+        self.commits = 0
+
+    async def execute(self, *args, **kwargs):
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+class _DriverError(Exception):
+    """Stands in for the asyncpg error wrapped by IntegrityError."""
+    def __init__(self, sqlstate):
+        super().__init__(sqlstate)
+        self.sqlstate = sqlstate
+
+
+def _integrity_error(sqlstate):
+    return IntegrityError("INSERT INTO messages ...", {}, _DriverError(sqlstate))
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Routes chat_manager's get_db() to a scripted session; fill session.script in the test."""
+    db = _Session([])
+
+    async def fake_get_db():
+        yield db
+
+    monkeypatch.setattr(chat_manager, "get_db", fake_get_db)
+    return db
+
+
+def test_second_turn_sees_queued_reply(session):
+    async def run():
+        queue = asyncio.Queue(maxsize=8)
+        first = message(role="user", content="hi")
+        chat_id, history, index = await chat_manager.prepare_chat_turn(None, first)
+        assert (history, index) == ([first], 0)
+
+        # The user message is stored; the reply is still waiting in the writer's queue
+        await chat_manager.queue_message(queue, chat_id, index + 1, message(role="assistant", content="hello"))
+        session.script = [_Result(rows=[(0, "user", "hi")])]
+        second = message(role="user", content="again")
+        _, history, index = await chat_manager.prepare_chat_turn(chat_id, second)
+
+        assert [m.content for m in history] == ["hi", "hello", "again"]
+        assert index == 2
+        assert queue.qsize() == 1
+        chat_manager._forget_pending([queue.get_nowait()])
+
+    asyncio.run(run())
+
+
+def test_taken_index_falls_back_to_next_free_index(session):
+    chat_id = uuid4()
+    session.script = [_integrity_error("23505"), _Result(scalar=4), _Result()]
+
+    index = asyncio.run(chat_manager.store_chat_turn(
+        chat_id, uuid4(), message(role="user", content="hi"), 2, new_chat=False))
+
+    assert index == 5
+    assert session.commits == 1
+    assert chat_manager._reserved_indexes.get(chat_id) == 7
+
+
+def test_missing_chat_is_not_retried_as_a_collision(session):
+    # A foreign-key violation (the chat was deleted) must not trigger the index fallback
+    session.script = [_integrity_error("23503")]
+
+    with pytest.raises(IntegrityError):
+        asyncio.run(chat_manager.store_chat_turn(
+            uuid4(), uuid4(), message(role="user", content="hi"), 2, new_chat=False))
+    assert session.script == []
+
+
+def test_unknown_chat_id_returns_400(session, monkeypatch):
+    from app import server
+
+    monkeypatch.setattr(server.app.state, "provider_slots",
+                        {provider: asyncio.Semaphore(1) for provider in server.HANDLERS}, raising=False)
+    session.script = [_Result(rows=[])]
+    request = ChatRequest(provider="openai", model="gpt-4o", chat_id=uuid4(),
+                          message=message(role="user", content="hi"),
+                          systemPrompt={"template_name": "default"})
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(server.chat(request, client_id=str(uuid4())))
+
+    assert exc_info.value.status_code == 400
+    assert exc_info.value.detail == "Chat not found"
+    # The provider slot taken for the turn was given back
+    assert not server.app.state.provider_slots[request.provider].locked()